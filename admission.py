@@ -0,0 +1,156 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+
+import metrics
+
+# ---------------------------
+# Config
+# ---------------------------
+# Per-employee chat requests: sustained rate and burst size.
+CHAT_RATE_PER_MINUTE = float(os.getenv("CHAT_RATE_PER_MINUTE", "12"))
+CHAT_BURST = int(os.getenv("CHAT_BURST", "4"))
+
+# Quick-action cards: no LLM call, but each one still writes the turn.
+CARD_RATE_PER_MINUTE = float(os.getenv("CARD_RATE_PER_MINUTE", "30"))
+CARD_BURST = int(os.getenv("CARD_BURST", "10"))
+
+# Per-session login attempts (each one reads the DB).
+LOGIN_RATE_PER_MINUTE = float(os.getenv("LOGIN_RATE_PER_MINUTE", "10"))
+LOGIN_BURST = int(os.getenv("LOGIN_BURST", "5"))
+
+# Process-wide caps: requests in flight, requests allowed to wait for a
+# slot, and how long they wait before being turned away.
+MAX_CONCURRENT_CHATS = int(os.getenv("MAX_CONCURRENT_CHATS", "16"))
+MAX_QUEUED_CHATS = int(os.getenv("MAX_QUEUED_CHATS", "32"))
+MAX_CONCURRENT_LOGINS = int(os.getenv("MAX_CONCURRENT_LOGINS", "8"))
+MAX_QUEUED_LOGINS = int(os.getenv("MAX_QUEUED_LOGINS", "16"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "10"))
+
+
+class Rejected(Exception):
+    """A request turned away before doing any work; retry after `retry_after` seconds."""
+
+    def __init__(self, reason: str, retry_after: float):
+        self.reason = reason
+        self.retry_after = max(1, round(retry_after))
+        super().__init__(f"{reason}, please retry in {self.retry_after}s")
+
+
+# ---------------------------------------------------------
+# PER-KEY TOKEN BUCKETS
+# ---------------------------------------------------------
+class RateLimiter:
+    """
+    One token bucket per key (employee id, session id): `burst` requests
+    at once, refilled at `per_minute`. Buckets that have refilled
+    completely carry no state and are pruned.
+    """
+
+    MAX_KEYS = 10_000
+
+    def __init__(self, name: str, per_minute: float, burst: int):
+        self.name = name
+        self.rate = per_minute / 60.0
+        self.burst = burst
+        self._buckets = {}  # key → (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    def check(self, key):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                metrics.ADMISSION_REJECTIONS.labels(self.name, "rate_limited").inc()
+                raise Rejected("Too many requests", (1 - tokens) / self.rate)
+
+            self._buckets[key] = (tokens - 1, now)
+            if len(self._buckets) > self.MAX_KEYS:
+                self._prune(now)
+
+    def _prune(self, now):
+        for key, (tokens, updated_at) in list(self._buckets.items()):
+            if tokens + (now - updated_at) * self.rate >= self.burst:
+                del self._buckets[key]
+
+
+# ---------------------------------------------------------
+# GLOBAL CONCURRENCY CAP + BOUNDED QUEUE
+# ---------------------------------------------------------
+class ConcurrencyGate:
+    """
+    At most `limit` holders at once. Up to `max_queue` more wait (for at
+    most `timeout` seconds); anything beyond that is rejected at once
+    instead of piling onto the LLM quota and DB pool.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int, timeout: float = ADMISSION_QUEUE_TIMEOUT):
+        self.name = name
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(limit)
+        self._waiting = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                if self._waiting >= self.max_queue:
+                    metrics.ADMISSION_REJECTIONS.labels(self.name, "queue_full").inc()
+                    raise Rejected("The assistant is busy", self.timeout)
+                self._waiting += 1
+                metrics.ADMISSION_QUEUE_DEPTH.labels(self.name).set(self._waiting)
+
+            try:
+                acquired = self._slots.acquire(timeout=self.timeout)
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+                    metrics.ADMISSION_QUEUE_DEPTH.labels(self.name).set(self._waiting)
+
+            if not acquired:
+                metrics.ADMISSION_REJECTIONS.labels(self.name, "queue_timeout").inc()
+                raise Rejected("The assistant is busy", self.timeout)
+
+        metrics.ADMISSION_IN_FLIGHT.labels(self.name).inc()
+        try:
+            yield
+        finally:
+            metrics.ADMISSION_IN_FLIGHT.labels(self.name).dec()
+            self._slots.release()
+
+
+chat_limiter = RateLimiter("chat", CHAT_RATE_PER_MINUTE, CHAT_BURST)
+chat_gate = ConcurrencyGate("chat", MAX_CONCURRENT_CHATS, MAX_QUEUED_CHATS)
+card_limiter = RateLimiter("card", CARD_RATE_PER_MINUTE, CARD_BURST)
+login_limiter = RateLimiter("login", LOGIN_RATE_PER_MINUTE, LOGIN_BURST)
+login_gate = ConcurrencyGate("login", MAX_CONCURRENT_LOGINS, MAX_QUEUED_LOGINS)
+
+
+# ---------------------------------------------------------
+# ENTRY POINTS
+# ---------------------------------------------------------
+@contextmanager
+def admit_chat(employee_key):
+    """Wrap one LLM turn: per-employee rate limit, then a global chat slot."""
+    chat_limiter.check(employee_key)
+    with chat_gate.slot():
+        yield
+
+
+def admit_card(employee_key):
+    """Admit one quick-action card (a history write, no LLM): per-employee rate limit only."""
+    card_limiter.check(employee_key)
+
+
+@contextmanager
+def admit_login(session_key):
+    """Wrap one login lookup: per-session rate limit, then a global DB slot."""
+    login_limiter.check(session_key)
+    with login_gate.slot():
+        yield
@@ -1,25 +1,23 @@
-import os
+import time
 import logging
-import streamlit as st
-from dotenv import load_dotenv
 
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_community.vectorstores import Chroma
+_APP_IMPORT_START = time.perf_counter()
 
-from langchain_groq import ChatGroq
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from dotenv import load_dotenv
 
-from assistant import Assistant
+# Light imports only: the ML stack (langchain, torch, Chroma, Groq) and the
+# DB layer are imported lazily so the login screen renders without them.
 from prompts import SYSTEM_PROMPT, WELCOME_MESSAGE
 from gui import AssistantGUI
+from cards import QUICK_ACTIONS, build_employee_cards
+import metrics
+import admission
+from lazy_imports import timed_import
+from resources import POLICY_PDF_PATH
 
-# DB
-from database import SessionLocal
-from services.employee_service import (
-    get_employee_by_code,
-    get_full_employee_profile
-)
+_APP_IMPORT_SECONDS = time.perf_counter() - _APP_IMPORT_START
 
 
 # ---------------------------------------------------------
@@ -34,78 +32,41 @@ if __name__ == "__main__":
     # ---------------------------------------------------------
     # CACHING HELPERS (performance improvements)
     # ---------------------------------------------------------
-    @st.cache_resource(show_spinner="Loading LLM…")
-    def load_llm():
-        """Cache LLM instance so it's created once per app instance."""
-        try:
-            return ChatGroq(model="llama-3.1-8b-instant")
-        except Exception as e:
-            logging.error(f"LLM init error: {e}")
-            raise
-
-    @st.cache_resource(show_spinner="Loading Embeddings…")
-    def load_embedding():
-        """Cache HuggingFace embeddings object."""
-        try:
-            return HuggingFaceEmbeddings(
-                model_name="sentence-transformers/all-MiniLM-L6-v2"
-            )
-        except Exception as e:
-            logging.error(f"Embedding init error: {e}")
-            raise
-
-    @st.cache_resource(ttl=3600, show_spinner="Loading Company Policies…")
-    def init_vector_store(pdf_path):
+    # LLM / embedding / vector store loaders live in resources.py so the
+    # warm-up stage can build them before the first visitor needs them.
+    @st.cache_resource
+    def start_metrics_endpoint():
+        """Expose /metrics for Prometheus once per server process."""
+        return metrics.start_metrics_server()
+
+    @st.cache_resource
+    def start_warmup():
         """
-        Initialize or load a persistent Chroma vectorstore.
-        - If ./data/vectorstore exists and looks populated, attempt to open it (fast).
-        - Otherwise, create vectorstore from PDF, persist it, and return.
-        Returns None on failure (the app will show existing error handling).
+        Kick off the warm-up stage on the first script run of this server
+        process: imports, LLM client + connection, embeddings and index are
+        built concurrently while the login form is shown.
         """
-        try:
-            embedding_function = load_embedding()
-            persistent_path = "/tmp/chroma"
-
-
-            # If persistent path exists and looks like a saved chroma DB, try to load
-            
-            # If pdf doesn't exist, return None (error handled by caller)
-            if not os.path.isfile(pdf_path):
-                logging.error(f"Vector Store Error: PDF not found at {pdf_path}")
-                return None
-
-            # Load PDF → split → embeddings → persist
-            loader = PyPDFLoader(pdf_path)
-            docs = loader.load()
-
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=2000,
-                chunk_overlap=200,
-            )
-            splits = text_splitter.split_documents(docs)
-
-            # Create vectorstore
-            vectorstore = Chroma.from_documents(
-                documents=splits,
-                embedding=embedding_function,
-                persist_directory=persistent_path,
-            )
-
-            logging.info("Created vectorstore and persisted to disk.")
-            return vectorstore
-
-        except Exception as e:
-            logging.error(f"Vector Store Error: {str(e)}")
-            return None
+        logging.info(f"app.py light imports took {_APP_IMPORT_SECONDS:.3f}s")
+        return timed_import("warmup").Warmup(POLICY_PDF_PATH).start()
 
-    # ---------------------------------------------------------
-    # CREATE/LOAD LLM + VECTOR STORE
-    # ---------------------------------------------------------
-    # LLM is now cached and reused across requests (faster).
-    llm = load_llm()
+    @st.cache_resource
+    def start_login_lookup():
+        """Keep valid employee codes in memory so bad logins never reach the DB."""
+        return timed_import("login_lookup").LoginLookup().start()
 
-    # Vector store is cached (or None if something failed)
-    vector_store = init_vector_store("data/umbrella_corp_policies.pdf")
+    @st.cache_resource
+    def start_index_refresher():
+        """Rebuild the policy index in the background when the PDF changes."""
+        return timed_import("index_refresher").IndexRefresher(POLICY_PDF_PATH).start()
+
+    start_metrics_endpoint()
+    warmup = start_warmup()
+    start_index_refresher()
+    login_lookup = start_login_lookup()
+
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        metrics.mark_session_active(ctx.session_id)
 
     # ---------------------------------------------------------
     # SESSION STATE
@@ -116,8 +77,8 @@ if __name__ == "__main__":
     if "employee_profile" not in st.session_state:
         st.session_state.employee_profile = None
 
-    if "quick_action" not in st.session_state:
-        st.session_state.quick_action = None
+    if "quick_card" not in st.session_state:
+        st.session_state.quick_card = None
 
     # ---------------------------------------------------------
     # SIDEBAR (BRANDING + LOGIN + PROFILE CARD)
@@ -145,19 +106,61 @@ if __name__ == "__main__":
                 submit = st.form_submit_button("Login")
 
             if submit:
-                db = SessionLocal()
-                emp = get_employee_by_code(db, employee_code)
-
-                if not emp:
+                database = timed_import("database")
+                SessionLocal, ReadSessionLocal = database.SessionLocal, database.ReadSessionLocal
+                ChatHistoryStore = timed_import("services.chat_history_service").ChatHistoryStore
+                load_employee_profile = timed_import("services.profile_snapshot_service").load_employee_profile
+                get_employee_aggregates = timed_import("services.aggregates_service").get_employee_aggregates
+
+                # Reads go to a replica; only a missing snapshot is written to the primary.
+                write_db = SessionLocal()
+
+                def load_login(db):
+                    # One pre-serialized snapshot row instead of six table reads.
+                    employee_id, profile, version = load_employee_profile(db, employee_code, write_db=write_db)
+                    # Leave balances, asset counts and goal ratios from grouped SQL.
+                    aggregates = get_employee_aggregates(db, employee_id) if profile else None
+                    return employee_id, profile, version, aggregates
+
+                # Per-session rate limit + a global cap on concurrent login reads.
+                rejected, profile = None, None
+                try:
+                    with admission.admit_login(ctx.session_id if ctx else "local"):
+                        # Unknown codes are answered from memory; only real ones hit the DB.
+                        employee_code = login_lookup.resolve(employee_code)
+                        if employee_code is not None:
+                            with metrics.PROFILE_LOAD_SECONDS.time():
+                                employee_id, profile, version, aggregates = database.run_read(load_login)
+                            if profile is None:
+                                login_lookup.mark_unknown(employee_code)
+                except admission.Rejected as e:
+                    rejected = e
+                finally:
+                    write_db.close()
+
+                if rejected is not None:
+                    st.warning(f"⏳ {rejected}")
+                elif profile is None:
                     st.error("❌ Employee not found")
                 else:
-                    profile = get_full_employee_profile(db, emp.id)
                     st.session_state.employee_profile = profile
+                    st.session_state.profile_version = version
+                    st.session_state.employee_id = employee_id
+                    st.session_state.employee_aggregates = aggregates
+
+                    # Deterministic quick-action answers, rendered without the LLM.
+                    st.session_state.employee_cards = build_employee_cards(profile, aggregates)
+
+                    # Resume the server-side conversation (bounded window).
+                    history_store = ChatHistoryStore(
+                        SessionLocal, employee_id, read_session_factory=ReadSessionLocal
+                    )
+                    st.session_state.history_store = history_store
+                    st.session_state.messages.extend(history_store.load_recent())
+
                     st.session_state["show_welcome"] = True
                     st.rerun()
 
-                db.close()
-
         # ---------- AFTER LOGIN ----------
         else:
             profile = st.session_state.employee_profile
@@ -209,26 +212,21 @@ if __name__ == "__main__":
             col1, col2 = st.columns(2)
 
             with col1:
-                if st.button("📝 Apply Leave"):
-                    st.session_state.quick_action = "I want to apply for leave. Show leave application steps."
-                    st.rerun()
+                if st.button(QUICK_ACTIONS["leave"][0]):
+                    st.session_state.quick_card = "leave"
 
-                if st.button("📄 Salary Details"):
-                    st.session_state.quick_action = "Show my salary details."
-                    st.rerun()
+                if st.button(QUICK_ACTIONS["salary"][0]):
+                    st.session_state.quick_card = "salary"
 
             with col2:
-                if st.button("🎯 My Goals"):
-                    st.session_state.quick_action = "Show my goals and performance."
-                    st.rerun()
+                if st.button(QUICK_ACTIONS["goals"][0]):
+                    st.session_state.quick_card = "goals"
 
-                if st.button("🛠 IT Assets"):
-                    st.session_state.quick_action = "Show all IT assets assigned to me."
-                    st.rerun()
+                if st.button(QUICK_ACTIONS["assets"][0]):
+                    st.session_state.quick_card = "assets"
 
-            if st.button("🗂 HR Policies"):
-                st.session_state.quick_action = "Show me all HR policies."
-                st.rerun()
+            if st.button(QUICK_ACTIONS["policies"][0]):
+                st.session_state.quick_card = "policies"
 
     # ---------------------------------------------------------
     # STOP CHAT IF NOT LOGGED IN
@@ -237,9 +235,30 @@ if __name__ == "__main__":
         st.info("🔒 Please log in using your Employee Code to use Axis.")
         st.stop()
 
+    # ---------------------------------------------------------
+    # READINESS GATE
+    # ---------------------------------------------------------
+    # Chat traffic waits for the warm-up stage instead of racing it.
+    if not warmup.is_ready:
+        with st.spinner("Axis is warming up…"):
+            warmup.wait()
+
+    # ---------------------------------------------------------
+    # CREATE/LOAD LLM + VECTOR STORE
+    # ---------------------------------------------------------
+    # Already built by the warm-up stage, so these are cache hits.
+    from resources import load_llm, init_vector_store, load_policy_card, policy_index_version
+
+    llm = load_llm()
+
+    # Vector store is cached (or None if something failed)
+    vector_store = init_vector_store(POLICY_PDF_PATH)
+
     # ---------------------------------------------------------
     # LLM + ASSISTANT
     # ---------------------------------------------------------
+    Assistant = timed_import("assistant").Assistant
+
     assistant = Assistant(
         system_prompt=SYSTEM_PROMPT,
         llm=llm,
@@ -248,23 +267,32 @@ if __name__ == "__main__":
     )
 
     assistant.employee_information = st.session_state.employee_profile
+    assistant.profile_version = st.session_state.get("profile_version")
+    assistant.employee_aggregates = st.session_state.get("employee_aggregates")
+    assistant.employee_id = st.session_state.get("employee_id")
+    assistant.history_cursors = st.session_state.setdefault("history_cursors", {})
+    assistant.history_requests = st.session_state.setdefault("history_requests", {})
 
-    gui = AssistantGUI(assistant)
+    gui = AssistantGUI(assistant, history_store=st.session_state.get("history_store"))
 
     # ---------------------------------------------------------
-    # HANDLE QUICK ACTION PROMPT
+    # HANDLE QUICK ACTION (precomputed card)
     # ---------------------------------------------------------
-    if st.session_state.quick_action:
-        user_query = st.session_state.quick_action
-        st.session_state.quick_action = None
-
-        st.session_state.messages.append({"role": "user", "content": user_query})
-
-        response_generator = assistant.get_response(user_query)
-        final_response = st.write_stream(response_generator)
+    # The button click already reran the script; the card is rendered in
+    # place after the chat history, with "Explain more" falling through
+    # to the LLM.
+    quick_card = None
+    if st.session_state.quick_card:
+        key = st.session_state.quick_card
+        st.session_state.quick_card = None
+
+        if key == "policies":
+            card = load_policy_card(POLICY_PDF_PATH, policy_index_version(POLICY_PDF_PATH))
+        else:
+            card = st.session_state.employee_cards[key]
 
-        st.session_state.messages.append({"role": "ai", "content": final_response})
-        st.rerun()
+        label, prompt = QUICK_ACTIONS[key]
+        quick_card = (label, card, prompt)
 
     # ---------------------------------------------------------
     # RENDER CHAT
@@ -296,4 +324,4 @@ if "show_welcome" in st.session_state and st.session_state.show_welcome:
     st.session_state.show_welcome = False
 
 # Now render chat normally
-gui.render()
+gui.render(quick_card)
@@ -1,12 +1,33 @@
+from functools import lru_cache
+
+from langchain_core.messages import SystemMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
+from langchain_core.runnables import RunnablePassthrough, RunnableLambda
+
+import metrics
+from context_format import format_context, format_profile
+from llm_backends import limit_concurrency
+from policy_categories import SCOPED_RETRIEVAL_MIN_RELEVANCE, category_filter, detect_categories
+from prompts import CONTEXT_PROMPT
+from database import SessionLocal, run_read
+from services.profile_snapshot_service import load_employee_profile
+from services.aggregates_service import get_employee_aggregates
+from services.history_service import SECTIONS, asks_for_next_page, get_history_page, parse_history_requests
+from services.team_service import asks_about_team, get_team_summary
+
 
-from database import SessionLocal
-from services.employee_service import (
-    get_employee_by_code,
-    get_full_employee_profile
-)
+@lru_cache(maxsize=4)
+def static_prefix(system_prompt):
+    """
+    The system message, built and measured once per process. It is sent
+    as-is (never templated), so every request starts with the same bytes.
+    """
+    return SystemMessage(content=system_prompt), metrics.estimate_tokens(system_prompt)
+
+
+def _filters(request):
+    return request["status"], request["date_from"], request["date_to"]
 
 
 class Assistant:
@@ -16,15 +37,27 @@ class Assistant:
         llm,
         message_history=[],
         vector_store=None,
+        context_prompt=CONTEXT_PROMPT,
     ):
         self.system_prompt = system_prompt
+        self.context_prompt = context_prompt
         self.llm = llm
         self.messages = message_history
         self.vector_store = vector_store
 
         # Will be set AFTER employee login
         self.employee_code = None
+        self.employee_id = None
         self.employee_information = None
+        self.employee_aggregates = None
+        # Snapshot version of employee_information; keys the formatted-profile cache.
+        self.profile_version = None
+
+        # section → {"filters", "cursor"} of the last page shown, and the
+        # sections last asked for, for "show more" follow-ups. Pass
+        # session-scoped dicts to keep them across reruns.
+        self.history_cursors = {}
+        self.history_requests = {}
 
         self.chain = self._get_conversation_chain()
 
@@ -33,34 +66,157 @@ class Assistant:
     # ---------------------------------------------------------
     def set_employee(self, employee_code: str):
         """Fetch employee profile from DB and store internally."""
-        db = SessionLocal()
+        write_db = SessionLocal()
 
-        emp = get_employee_by_code(db, employee_code)
-        if not emp:
-            db.close()
+        def load(db):
+            employee_id, profile, version = load_employee_profile(db, employee_code, write_db=write_db)
+            aggregates = get_employee_aggregates(db, employee_id) if profile else None
+            return employee_id, profile, version, aggregates
+
+        with metrics.PROFILE_LOAD_SECONDS.time():
+            employee_id, profile, version, aggregates = run_read(load)
+        write_db.close()
+
+        if profile is None:
             raise ValueError(f"Employee '{employee_code}' not found")
 
-        self.employee_information = get_full_employee_profile(db, emp.id)
+        self.employee_information = profile
+        self.profile_version = version
+        self.employee_aggregates = aggregates
         self.employee_code = employee_code
-
-        db.close()
+        self.employee_id = employee_id
         print(f"✅ Employee profile loaded: {employee_code}")
 
     # ---------------------------------------------------------
     # Chat Response
     # ---------------------------------------------------------
     def get_response(self, user_input):
-        return self.chain.stream(user_input)
+        return metrics.observe_stream(limit_concurrency(self.chain.stream(user_input)))
+
+    # ---------------------------------------------------------
+    # Instrumented chain steps
+    # ---------------------------------------------------------
+    def _retrieve_policies(self, user_input):
+        # Pin the index version for this query; a concurrent rebuild swaps
+        # in the next one without affecting it.
+        categories = detect_categories(user_input)
+        with metrics.RETRIEVAL_SECONDS.time(), self.vector_store.acquire() as store:
+            if categories:
+                # Search the question's categories (and untagged chunks);
+                # a weak best match means the keywords misled us.
+                scored = store.similarity_search_with_relevance_scores(
+                    user_input, k=4, filter=category_filter(categories)
+                )
+                if scored and scored[0][1] >= SCOPED_RETRIEVAL_MIN_RELEVANCE:
+                    metrics.RETRIEVAL_QUERIES.labels("+".join(categories)).inc()
+                    return [doc for doc, _ in scored]
+                metrics.RETRIEVAL_QUERIES.labels("fallback").inc()
+            else:
+                metrics.RETRIEVAL_QUERIES.labels("all").inc()
+            return store.as_retriever().invoke(user_input)
+
+    def _employee_context(self, user_input):
+        """
+        Compact text of the profile fields (formatted once per snapshot
+        version) followed by this question's aggregates and lists.
+        """
+        profile = self.employee_information
+        if not profile:
+            return ""
+
+        fields = {k: v for k, v in profile.items() if k not in SECTIONS}
+        cache_key = (profile.get("employee_code"), self.profile_version) if self.profile_version else None
+
+        parts = [format_profile(fields, cache_key), format_context(self._requested_context(user_input))]
+        return "\n".join(part for part in parts if part)
+
+    def _requested_context(self, user_input):
+        """
+        Compact aggregates, plus list sections only when the question asks
+        for them, as a bounded, filtered page.
+        """
+        profile = self.employee_information
+        context = {}
+        if self.employee_aggregates is not None:
+            context["summary"] = self.employee_aggregates
+
+        if self.employee_id is not None and asks_about_team(user_input):
+            team = run_read(lambda db: get_team_summary(db, self.employee_id))
+            context["team"] = team or "No employees report to this user."
+
+        requests = parse_history_requests(user_input)
+        if not requests and asks_for_next_page(user_input):
+            # A bare "show more" continues the sections (and filters) asked about last.
+            requests = {section: dict(request, next_page=True) for section, request in self.history_requests.items()}
+        if not requests:
+            return context
+        self.history_requests.clear()
+        self.history_requests.update(requests)
+
+        if self.employee_id is None:
+            # No DB handle for this employee: fall back to the profile's recent rows.
+            for section in requests:
+                context[section] = profile.get(section, [])
+            return context
+
+        def fetch_pages(db):
+            pages = {}
+            for section, request in requests.items():
+                cursor = None
+                if request["next_page"]:
+                    # A cursor only continues the listing it came from.
+                    last = self.history_cursors.get(section)
+                    if last and last["filters"] == _filters(request):
+                        if last["cursor"] is None:
+                            continue  # the last page was already shown
+                        cursor = last["cursor"]
+                pages[section] = get_history_page(
+                    db,
+                    self.employee_id,
+                    section,
+                    status=request["status"],
+                    date_from=request["date_from"],
+                    date_to=request["date_to"],
+                    cursor=cursor,
+                )
+            return pages
+
+        pages = run_read(fetch_pages)
+        for section, request in requests.items():
+            page = pages.get(section)
+            if page is None:
+                context[section] = []
+                context[f"{section}_note"] = "No older records; everything matching was already shown."
+                continue
+            self.history_cursors[section] = {"filters": _filters(request), "cursor": page["next_cursor"]}
+            context[section] = page["items"]
+            if page["has_more"]:
+                context[f"{section}_note"] = "More records exist; ask to \"show more\" to see older ones."
+
+        return context
+
+    def _record_prompt_tokens(self, prompt_value):
+        metrics.INPUT_TOKENS.observe(metrics.estimate_tokens(prompt_value.to_string()))
+        metrics.CONTEXT_TOKENS.observe(metrics.estimate_tokens(prompt_value.to_messages()[-1].content))
+        return prompt_value
 
     # ---------------------------------------------------------
     # LangChain Pipeline
     # ---------------------------------------------------------
     def _get_conversation_chain(self):
+        # Static prefix → append-only history → per-request context + query.
+        # Only the last message changes between turns, so the prefix is
+        # reusable by providers / local servers with prompt caching. History
+        # is trimmed in CHAT_TRIM_BLOCK blocks, so the prefix only shifts
+        # once per block instead of every turn once the window is full.
+        system_message, prefix_tokens = static_prefix(self.system_prompt)
+        metrics.PROMPT_PREFIX_TOKENS.set(prefix_tokens)
+
         prompt = ChatPromptTemplate(
             [
-                ("system", self.system_prompt),
+                system_message,
                 MessagesPlaceholder("conversation_history"),
-                ("human", "{user_input}"),
+                ("human", self.context_prompt),
             ]
         )
 
@@ -68,12 +224,15 @@ class Assistant:
 
         chain = (
             {
-                "retrieved_policy_information": self.vector_store.as_retriever(),
-                "employee_information": lambda x: self.employee_information,
+                "retrieved_policy_information": RunnableLambda(self._retrieve_policies),
+                "employee_information": RunnableLambda(self._employee_context),
                 "user_input": RunnablePassthrough(),
-                "conversation_history": lambda x: self.messages,
+                "conversation_history": lambda x: [
+                    {"role": m["role"], "content": m["content"]} for m in self.messages
+                ],
             }
             | prompt
+            | RunnableLambda(self._record_prompt_tokens)
             | self.llm
             | parser
         )
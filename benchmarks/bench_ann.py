@@ -0,0 +1,173 @@
+"""
+Recall and latency of approximate policy search vs brute force.
+
+Generates N synthetic unit vectors (clustered like real chunk embeddings,
+spread over --tenants handbooks) and measures, per configuration, query
+latency and recall@k against exact float32 search:
+
+  exact   float32 / int8 brute force (NumpyVectorStore, NUMPY_INDEX_LISTS=0)
+  ivf     float32 / int8 IVF lists, for each --probes (NUMPY_INDEX_PROBES)
+  hnsw    Chroma's HNSW for each --ef-search (with --chroma, needs chromadb)
+
+Rows are partitioned by tenant; "tenant" rows repeat the measurement
+with a one-tenant filter (NUMPY_INDEX_PARTITION_FIELD=tenant).
+
+    python benchmarks/bench_ann.py --sizes 10000 100000 1000000
+"""
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+from langchain_core.documents import Document
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from vector_index import NumpyVectorStore, IndexLayout, build_layout, quantize, _normalize  # noqa: E402
+
+DIM = 384  # all-MiniLM-L6-v2
+
+
+def _jitter(rng, vectors, noise):
+    """Add a random vector of norm ~`noise` to each (unit) row, renormalise."""
+    return _normalize(vectors + noise / np.sqrt(DIM) * rng.standard_normal(vectors.shape, dtype=np.float32))
+
+
+def synthetic_corpus(n, topics, noise, seed=0):
+    """Unit vectors scattered around `topics` random directions."""
+    rng = np.random.default_rng(seed)
+    centers = _normalize(rng.standard_normal((topics, DIM), dtype=np.float32))
+    vectors = np.empty((n, DIM), dtype=np.float32)
+    for start in range(0, n, 65536):
+        end = min(start + 65536, n)
+        vectors[start:end] = _jitter(rng, centers[rng.integers(0, topics, end - start)], noise)
+    return vectors
+
+
+def synthetic_queries(vectors, n, noise, seed=1):
+    """Perturbed corpus rows: each query has close neighbours, like a real question."""
+    rng = np.random.default_rng(seed)
+    return _jitter(rng, vectors[rng.integers(0, vectors.shape[0], n)], noise)
+
+
+def measure(search, queries, truth, k):
+    """(p50 ms, p95 ms, recall@k) of `search(query) -> row ids`."""
+    latencies, hits = [], 0
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        ids = search(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits += len(set(map(int, ids)) & expected)
+    p50, p95 = np.percentile(latencies, [50, 95])
+    return p50, p95, hits / (k * len(queries))
+
+
+def chroma_searches(vectors, k, m, ef_construction, ef_search_values):
+    """One HNSW collection per ef_search (it is fixed at creation): ef → search(query) -> row ids."""
+    import chromadb
+
+    client = chromadb.EphemeralClient()
+    searches = {}
+    for ef_search in ef_search_values:
+        collection = client.create_collection(
+            f"bench-{vectors.shape[0]}-{ef_search}",
+            metadata={"hnsw:M": m, "hnsw:construction_ef": ef_construction, "hnsw:search_ef": ef_search},
+        )
+        start = time.perf_counter()
+        for offset in range(0, vectors.shape[0], 5000):
+            block = vectors[offset:offset + 5000]
+            collection.add(
+                ids=[str(i) for i in range(offset, offset + block.shape[0])],
+                embeddings=block.tolist(),
+            )
+        print(f"  hnsw M={m} ef_construction={ef_construction}: built in {time.perf_counter() - start:.1f}s")
+
+        def search(query, collection=collection):
+            result = collection.query(query_embeddings=[query.tolist()], n_results=k, include=["distances"])
+            return [int(i) for i in result["ids"][0]]
+
+        searches[ef_search] = search
+    return searches
+
+
+def run(n, args):
+    print(f"\n=== {n:,} chunks, {args.tenants} tenants ===")
+    lists = args.lists or max(1, int(4 * np.sqrt(n)))
+
+    vectors = synthetic_corpus(n, args.topics, args.noise)
+    queries = synthetic_queries(vectors, args.queries, args.query_noise)
+
+    # One shared Document per tenant: the stores only read metadata.
+    tenant_docs = [Document(page_content="", metadata={"tenant": f"t{t}"}) for t in range(args.tenants)]
+    documents = [tenant_docs[i % args.tenants] for i in range(n)]
+    tenant_filter = {"tenant": "t0"}
+
+    start = time.perf_counter()
+    order, ivf = build_layout(vectors, documents, lists, "tenant")
+    build_seconds = time.perf_counter() - start
+    matrix, documents = vectors[order], [documents[i] for i in order]
+    del vectors
+    codes, scales = quantize(matrix)
+    print(f"  ivf: {lists} lists built in {build_seconds:.1f}s; "
+          f"matrix {matrix.nbytes / 2**20:.0f} MB float32, {(codes.nbytes + scales.nbytes) / 2**20:.0f} MB int8")
+
+    # Same row order, tenant partitions only: exact search.
+    exact = IndexLayout(ivf.offsets[:, [0, -1]], None, ivf.partition_field, ivf.partitions)
+    stores = {
+        ("exact", "float32"): NumpyVectorStore(None, matrix, documents, layout=exact),
+        ("exact", "int8"): NumpyVectorStore(None, codes, documents, scales, layout=exact),
+        ("ivf", "float32"): NumpyVectorStore(None, matrix, documents, layout=ivf),
+        ("ivf", "int8"): NumpyVectorStore(None, codes, documents, scales, layout=ivf),
+    }
+    reference = stores[("exact", "float32")]
+    truth = {
+        None: [set(map(int, reference.search_rows(q, args.k)[0])) for q in queries],
+        "tenant": [set(map(int, reference.search_rows(q, args.k, tenant_filter)[0])) for q in queries],
+    }
+
+    rows = []
+    for scope in (None, "tenant"):
+        flt = tenant_filter if scope else None
+        for dtype in ("float32", "int8"):
+            store = stores[("exact", dtype)]
+            rows.append(("exact", dtype, "-", scope, measure(
+                lambda q: store.search_rows(q, args.k, flt)[0], queries, truth[scope], args.k)))
+            store = stores[("ivf", dtype)]
+            for probes in args.probes:
+                rows.append(("ivf", dtype, f"probes={probes}", scope, measure(
+                    lambda q: store.search_rows(q, args.k, flt, probes)[0], queries, truth[scope], args.k)))
+
+    if args.chroma:
+        for ef, search in chroma_searches(matrix, args.k, args.m, args.ef_construction, args.ef_search).items():
+            rows.append(("hnsw", "float32", f"ef_search={ef}", None, measure(search, queries, truth[None], args.k)))
+
+    print(f"  {'index':<6} {'dtype':<8} {'params':<14} {'scope':<7} {'p50 ms':>8} {'p95 ms':>8} {'recall@' + str(args.k):>10}")
+    for index, dtype, params, scope, (p50, p95, recall) in rows:
+        print(f"  {index:<6} {dtype:<8} {params:<14} {scope or 'all':<7} {p50:>8.2f} {p95:>8.2f} {recall:>10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=4, help="retriever top-k (LangChain's default)")
+    parser.add_argument("--tenants", type=int, default=8)
+    parser.add_argument("--topics", type=int, default=2000, help="clusters in the synthetic corpus")
+    parser.add_argument("--noise", type=float, default=0.6, help="spread of chunks around their topic")
+    parser.add_argument("--query-noise", type=float, default=0.4)
+    parser.add_argument("--lists", type=int, default=0, help="IVF lists (0 = 4 * sqrt(N))")
+    parser.add_argument("--probes", type=int, nargs="+", default=[4, 16, 64])
+    parser.add_argument("--chroma", action="store_true", help="also benchmark Chroma HNSW")
+    parser.add_argument("--m", type=int, default=16)
+    parser.add_argument("--ef-construction", type=int, default=100)
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[10, 50, 100])
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        run(n, args)
+
+
+if __name__ == "__main__":
+    main()
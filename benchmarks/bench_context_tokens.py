@@ -0,0 +1,137 @@
+"""
+Prompt size of employee_information: Python dict repr vs context_format.
+
+Builds a synthetic employee with full list sections (PROFILE_LIST_LIMIT
+rows each), aggregates and a manager's team, and reports characters and
+estimated tokens for the old `str(dict)` injection and the compact
+serializer, for a plain question and for one that asks for every list.
+
+    python benchmarks/bench_context_tokens.py --rows 10 --team 12
+"""
+import os
+import sys
+import random
+import argparse
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from context_format import format_context  # noqa: E402
+from metrics import estimate_tokens  # noqa: E402
+
+LEAVE_TYPES = ["Sick Leave", "Casual Leave", "Earned Leave"]
+ASSETS = ["Laptop", "Monitor", "Employee ID Card", "Access Card"]
+SKILLS = ["Python", "SQL", "Machine Learning", "Excel", "ReactJS", "Leadership"]
+CERTIFICATIONS = ["AWS Practitioner", "Azure AI-900", "PMP", None, None]
+GOAL_STATUS = ["In Progress", "Completed", "Pending Review"]
+
+
+def _day(offset):
+    return str(date(2025, 1, 1) + timedelta(days=offset))
+
+
+def build_profile(rows):
+    ctc = 900000
+    return {
+        "employee_code": "EMP001",
+        "name": "Employee 1",
+        "email": "employee1@axisme.com",
+        "phone": "9876512345",
+        "gender": "Female",
+        "dob": "1999-04-12",
+        "role": "AI Engineer",
+        "department": "AI Research",
+        "location": "Chennai",
+        "job_level": "L2",
+        "join_date": "2022-06-01",
+        "employment_type": "Full-Time",
+        "emergency_contact": "9876543210",
+        "address": "123 Corporate Street, Chennai",
+        "salary": {
+            "ctc": ctc, "basic_pay": ctc * 0.40, "hra": ctc * 0.20,
+            "pf": ctc * 0.05, "esi": ctc * 0.01, "tax_deduction": ctc * 0.10,
+        },
+        "skills": [
+            {"skill_name": random.choice(SKILLS), "experience_years": random.randint(1, 6),
+             "certification": random.choice(CERTIFICATIONS)}
+            for _ in range(rows)
+        ],
+        "goals": [
+            {"goal_title": f"Goal {i}", "description": f"Complete quarterly target {i}",
+             "due_date": _day(30 * i), "status": random.choice(GOAL_STATUS)}
+            for i in range(rows)
+        ],
+        "assets": [
+            {"asset_type": random.choice(ASSETS), "serial_number": f"SN{random.randint(100000, 999999)}",
+             "issue_date": _day(-10 * i), "status": "Active"}
+            for i in range(rows)
+        ],
+        "leave_history": [
+            {"leave_type": random.choice(LEAVE_TYPES), "start_date": _day(7 * i),
+             "end_date": _day(7 * i + 1), "status": "Approved"}
+            for i in range(rows)
+        ],
+    }
+
+
+def build_summary():
+    return {
+        "leave_balance": {
+            "year": 2025,
+            "by_type": {
+                t: {"entitlement": 12, "taken": 3, "pending": 1, "remaining": 9} for t in LEAVE_TYPES
+            },
+            "pending_requests": 1,
+        },
+        "assets_by_status": {"Active": 3, "Returned": 1},
+        "goals": {"total": 5, "completed": 2, "completion_ratio": 0.4,
+                  "by_status": {"Completed": 2, "In Progress": 3}},
+    }
+
+
+def build_team(size):
+    return [
+        {"employee_code": f"EMP{i:03d}", "name": f"Employee {i}", "role": "Data Analyst",
+         "department": "AI Research", "level": "direct", "leaves_this_year": 2,
+         "pending_leave_requests": 0, "active_assets": 3, "goals_completed": "1/3"}
+        for i in range(2, size + 2)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10, help="rows per list section")
+    parser.add_argument("--team", type=int, default=12, help="reports in the team summary")
+    args = parser.parse_args()
+
+    random.seed(7)
+    profile = build_profile(args.rows)
+    summary = build_summary()
+    lists = ("skills", "goals", "assets", "leave_history")
+    fields = {k: v for k, v in profile.items() if k not in lists}
+
+    # Same data on both sides; only the serialization differs.
+    cases = {
+        "plain question": (
+            str({**fields, "summary": summary}),
+            format_context({**fields, "summary": summary}),
+        ),
+        "all lists + team": (
+            str({**profile, "summary": summary, "team": build_team(args.team)}),
+            format_context({**profile, "summary": summary, "team": build_team(args.team)}),
+        ),
+    }
+
+    print(f"\n{'case':<18} {'before chars':>13} {'after chars':>12} {'before tok':>11} {'after tok':>10} {'saved':>7}")
+    for name, (before, after) in cases.items():
+        before_tokens, after_tokens = estimate_tokens(before), estimate_tokens(after)
+        saved = 1 - after_tokens / before_tokens
+        print(f"{name:<18} {len(before):>13} {len(after):>12} {before_tokens:>11} {after_tokens:>10} {saved:>7.0%}")
+
+    print("\nSample (all lists + team):\n")
+    print(cases["all lists + team"][1][:1200])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Compare embedding backends (torch vs ONNX vs ONNX int8) on this machine.
+
+Each backend runs in its own subprocess so peak RSS is not polluted by
+the others. Reports load time, throughput, peak RSS and how close the
+vectors are to the torch reference.
+
+    python embeddings.py --export --quantize     # once
+    python benchmarks/bench_embeddings.py
+"""
+import os
+import sys
+import json
+import time
+import resource
+import argparse
+import subprocess
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BACKENDS = ["torch", "onnx", "onnx-int8"]
+
+SAMPLE_TEXTS = [
+    "How many casual leaves can I carry forward to next year?",
+    "Employees must return all IT assets, including laptops and access cards, on their last working day.",
+    "What is the reimbursement limit for work-from-home internet expenses?",
+    "Earned leave accrues at 1.5 days per month of completed service and can be encashed at exit.",
+    "Who approves overtime for contract staff in the Hyderabad office?",
+    "The annual appraisal cycle runs from April to March with a mid-year check-in in October.",
+]
+
+
+def _peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_worker(backend, n_texts, out_path):
+    from embeddings import create_embeddings
+
+    texts = [SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)] + f" ({i})" for i in range(n_texts)]
+
+    start = time.perf_counter()
+    emb = create_embeddings(backend)
+    emb.embed_query("warm-up")
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectors = emb.embed_documents(texts)
+    embed_seconds = time.perf_counter() - start
+
+    np.save(out_path, np.asarray(vectors, dtype=np.float32))
+    print(json.dumps({
+        "backend": backend,
+        "load_s": load_seconds,
+        "texts_per_s": n_texts / embed_seconds,
+        "peak_rss_mb": _peak_rss_mb(),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--texts", type=int, default=512)
+    parser.add_argument("--backends", nargs="+", default=BACKENDS)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.texts, args.out)
+        return
+
+    results, vectors = [], {}
+    for backend in args.backends:
+        out_path = os.path.join("/tmp", f"axis_bench_{backend}.npy")
+        proc = subprocess.run(
+            [sys.executable, __file__, "--worker", backend, "--out", out_path, "--texts", str(args.texts)],
+            capture_output=True, text=True, cwd=ROOT,
+        )
+        output = proc.stdout.strip().splitlines()
+        if proc.returncode != 0 or not output:
+            print(f"⚠️  {backend} failed:\n{(proc.stderr.strip().splitlines() or ['<no output>'])[-1]}")
+            continue
+        results.append(json.loads(output[-1]))
+        vectors[backend] = np.load(out_path)
+
+    reference = vectors.get("torch")
+
+    print(f"\n{'backend':<10} {'load (s)':>9} {'texts/s':>9} {'peak RSS (MB)':>14} {'min cos vs torch':>17}")
+    for r in results:
+        cos = "-"
+        if reference is not None and r["backend"] != "torch":
+            # Vectors are L2-normalised, so the row-wise dot product is the cosine.
+            cos = f"{float((reference * vectors[r['backend']]).sum(axis=1).min()):.5f}"
+        print(f"{r['backend']:<10} {r['load_s']:>9.2f} {r['texts_per_s']:>9.1f} {r['peak_rss_mb']:>14.0f} {cos:>17}")
+
+
+if __name__ == "__main__":
+    main()
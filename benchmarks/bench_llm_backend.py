@@ -0,0 +1,79 @@
+"""
+Load test for the configured LLM backend.
+
+Fires --requests prompts with --concurrency parallel streams through the
+same path the chat UI uses (`llm.stream` → limit_concurrency →
+metrics.observe_stream), then the same prompts once more through
+`generate_batch`. Reports time to first token, per-request latency and
+overall throughput.
+
+    python benchmarks/stub_llm_server.py &        # or llama-server / vLLM
+    LLM_BACKEND=openai LLM_MAX_CONCURRENCY=4 LLM_SEED=7 \\
+        python benchmarks/bench_llm_backend.py --requests 32 --concurrency 8
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import metrics  # noqa: E402
+from llm_backends import LLM_BACKEND, LLM_MAX_CONCURRENCY, create_llm, generate_batch, limit_concurrency  # noqa: E402
+
+PROMPT = "What is my leave balance for this year?"
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+def run_stream(llm):
+    start = time.perf_counter()
+    first, pieces = None, []
+    for chunk in metrics.observe_stream(limit_concurrency(c.content for c in llm.stream(PROMPT))):
+        if first is None:
+            first = time.perf_counter() - start
+        pieces.append(chunk)
+    return first, time.perf_counter() - start, "".join(pieces)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=8, help="client threads (the slot limit is LLM_MAX_CONCURRENCY)")
+    args = parser.parse_args()
+
+    llm = create_llm()
+    print(f"Backend: {LLM_BACKEND}, LLM_MAX_CONCURRENCY={LLM_MAX_CONCURRENCY or 'unlimited'}")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda _: run_stream(llm), range(args.requests)))
+    wall = time.perf_counter() - start
+
+    ttft = [r[0] for r in results if r[0] is not None]
+    latency = [r[1] for r in results]
+    tokens = sum(metrics.estimate_tokens(r[2]) for r in results)
+
+    print(f"\nStreaming ({args.requests} requests, {args.concurrency} clients)")
+    print(f"  TTFT     p50 {statistics.median(ttft):.3f}s  p95 {_percentile(ttft, 0.95):.3f}s")
+    print(f"  latency  p50 {statistics.median(latency):.3f}s  p95 {_percentile(latency, 0.95):.3f}s")
+    print(f"  {args.requests / wall:.2f} req/s, ~{tokens / wall:.0f} tokens/s")
+
+    start = time.perf_counter()
+    replies = generate_batch(llm, [PROMPT] * args.requests)
+    wall = time.perf_counter() - start
+
+    tokens = sum(metrics.estimate_tokens(r.content) for r in replies)
+    print(f"\nBatch ({args.requests} prompts)")
+    print(f"  {wall:.2f}s total, {args.requests / wall:.2f} req/s, ~{tokens / wall:.0f} tokens/s")
+    print(f"  identical replies: {len({r.content for r in replies}) == 1}")
+
+
+if __name__ == "__main__":
+    main()
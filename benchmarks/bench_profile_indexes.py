@@ -0,0 +1,118 @@
+"""
+Profile-load latency before/after migration 0001 (child-table indexes).
+
+Seeds a throwaway SQLite database with N employees (default 100k) and
+their child rows, drops the new indexes to mimic the old schema, times
+`get_full_employee_profile` for random employees, then applies the
+migration and times it again.
+
+    python benchmarks/bench_profile_indexes.py --employees 100000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DB_PATH = "/tmp/axis_bench_indexes.db"
+os.environ["SUPABASE_DB_URL"] = f"sqlite:///{DB_PATH}"
+
+from sqlalchemy import insert, text  # noqa: E402
+
+from database import SessionLocal, engine  # noqa: E402
+from models import (  # noqa: E402
+    Base, Employee, EmployeeSalary, LeaveRecord, SkillRecord, AssetRecord, GoalRecord
+)
+from migrations import upgrade  # noqa: E402
+from services.employee_service import get_full_employee_profile  # noqa: E402
+
+# Child-table indexes added by migrations 0001 and 0003; the baseline has none.
+NEW_INDEXES = [
+    "uq_employee_salary_employee_id",
+    "ix_leave_records_employee_id_status",
+    "ix_skills_employee_id",
+    "ix_assets_employee_id_status",
+    "ix_goals_employee_id_due_date",
+    "ix_leave_records_employee_id_start_date",
+    "ix_assets_employee_id_issue_date",
+]
+
+
+def seed(n, batch=10_000):
+    today = date.today()
+    with engine.begin() as conn:
+        for start in range(1, n + 1, batch):
+            ids = range(start, min(start + batch, n + 1))
+            conn.execute(insert(Employee), [
+                {"id": i, "employee_code": f"EMP{i:06d}", "name": f"Employee {i}",
+                 "email": f"employee{i}@axisme.com", "role": "Software Engineer",
+                 "join_date": date(2022, 1, 1)}
+                for i in ids
+            ])
+            conn.execute(insert(EmployeeSalary), [
+                {"employee_id": i, "ctc": 800000, "basic_pay": 320000, "last_updated": today} for i in ids
+            ])
+            conn.execute(insert(SkillRecord), [
+                {"employee_id": i, "skill_name": s, "experience_years": 2} for i in ids for s in ("Python", "SQL", "Excel")
+            ])
+            conn.execute(insert(LeaveRecord), [
+                {"employee_id": i, "leave_type": "Casual Leave", "start_date": today - timedelta(days=d),
+                 "end_date": today - timedelta(days=d - 1), "status": "Approved"}
+                for i in ids for d in (10, 40)
+            ])
+            conn.execute(insert(AssetRecord), [
+                {"employee_id": i, "asset_type": "Laptop", "serial_number": f"SN{i}", "issue_date": today,
+                 "status": "Active"} for i in ids
+            ])
+            conn.execute(insert(GoalRecord), [
+                {"employee_id": i, "goal_title": "Quarterly Objective", "due_date": today + timedelta(days=90),
+                 "status": "In Progress"} for i in ids
+            ])
+
+
+def time_profiles(n, lookups):
+    rng = random.Random(42)
+    db = SessionLocal()
+    start = time.perf_counter()
+    for _ in range(lookups):
+        get_full_employee_profile(db, rng.randint(1, n))
+    elapsed = time.perf_counter() - start
+    db.close()
+    return elapsed / lookups * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--employees", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=50)
+    args = parser.parse_args()
+
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for name in NEW_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+    print(f"⏳ Seeding {args.employees:,} employees…")
+    start = time.perf_counter()
+    seed(args.employees)
+    print(f"   done in {time.perf_counter() - start:.1f}s")
+
+    before = time_profiles(args.employees, args.lookups)
+    print(f"Without indexes: {before:8.2f} ms / profile")
+
+    upgrade(engine)
+
+    after = time_profiles(args.employees, args.lookups)
+    print(f"With indexes:    {after:8.2f} ms / profile")
+    print(f"Speedup:         {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Local check of read-replica routing with two SQLite databases.
+
+A throwaway primary.db and replica.db stand in for Supabase and a read
+replica, and the script asserts that:
+
+  - run_read sends reads to the replica
+  - an error from the primary inside run_read (e.g. load_login's
+    profile-snapshot write) is raised without marking the replica down
+  - a failing replica is marked down and the read retried on the primary
+  - ChatHistoryStore.load_recent reads the turns just written from the
+    primary, even when the replica has not caught up
+
+    python benchmarks/check_read_replicas.py
+"""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+WORKDIR = tempfile.mkdtemp(prefix="axis-replicas-")
+PRIMARY_URL = f"sqlite:///{os.path.join(WORKDIR, 'primary.db')}"
+REPLICA_URL = f"sqlite:///{os.path.join(WORKDIR, 'replica.db')}"
+
+# database.py reads its config at import time.
+os.environ["SUPABASE_DB_URL"] = PRIMARY_URL
+os.environ["SUPABASE_DB_REPLICA_URLS"] = REPLICA_URL
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+import database  # noqa: E402
+from database import SessionLocal, ReadSessionLocal, router, run_read  # noqa: E402
+from models import Base, Employee  # noqa: E402
+from services.chat_history_service import ChatHistoryStore  # noqa: E402
+
+PROBE = text("SELECT name FROM probe")
+
+
+def setup():
+    replica = router.replicas[0]
+    for bind, name in ((database.engine, "primary"), (replica, "replica")):
+        with bind.begin() as conn:
+            conn.execute(text("CREATE TABLE probe (name TEXT)"))
+            conn.execute(text("INSERT INTO probe VALUES (:name)"), {"name": name})
+    # Only the primary has the chat tables: the replica "has not caught up".
+    Base.metadata.create_all(database.engine, tables=[Employee.__table__, Base.metadata.tables["chat_messages"]])
+    return replica
+
+
+def check_reads_use_replica(replica):
+    assert run_read(lambda db: db.execute(PROBE).scalar()) == "replica"
+    assert router.is_healthy(replica)
+    print("✅ reads go to the replica")
+
+
+def check_primary_error_keeps_replica(replica):
+    def load_login(db):
+        db.execute(PROBE).scalar()
+        write_db = SessionLocal()
+        try:
+            return write_db.execute(text("SELECT * FROM missing_table")).all()
+        finally:
+            write_db.close()
+
+    try:
+        run_read(load_login)
+    except OperationalError:
+        pass
+    else:
+        raise AssertionError("the primary error was swallowed")
+    assert router.is_healthy(replica), "replica marked down for a primary error"
+    print("✅ a primary error inside run_read leaves the replica healthy")
+
+
+def check_replica_error_fails_over(replica):
+    with replica.begin() as conn:
+        conn.execute(text("DROP TABLE probe"))
+    assert run_read(lambda db: db.execute(PROBE).scalar()) == "primary"
+    healthy, _ = router._health[replica]
+    assert not healthy, "failing replica not marked down"
+    print("✅ a failing replica is marked down and the read retried on the primary")
+
+
+def check_recent_history_from_primary():
+    db = SessionLocal()
+    try:
+        db.add(Employee(id=1, employee_code="EMP001", name="Test", role="Engineer"))
+        db.commit()
+    finally:
+        db.close()
+
+    store = ChatHistoryStore(SessionLocal, 1, read_session_factory=ReadSessionLocal)
+    store.append({"role": "user", "content": "hi"}, {"role": "ai", "content": "hello"})
+    assert [m["content"] for m in store.load_recent()] == ["hi", "hello"]
+    print("✅ load_recent reads the latest turns from the primary")
+
+
+def main():
+    print(f"primary {PRIMARY_URL}\nreplica {REPLICA_URL}")
+    replica = setup()
+    check_reads_use_replica(replica)
+    check_primary_error_keeps_replica(replica)
+    check_replica_error_fails_over(replica)
+    check_recent_history_from_primary()
+
+
+if __name__ == "__main__":
+    main()
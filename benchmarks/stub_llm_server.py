@@ -0,0 +1,101 @@
+"""
+Deterministic OpenAI-compatible chat server for load tests.
+
+Answers every /v1/chat/completions request with the same text, streamed
+word by word with a fixed delay, and serves /v1/models for the warm-up
+pre-connect. No model, no GPU: latency is whatever --token-delay says.
+
+    python benchmarks/stub_llm_server.py --port 8080 --token-delay 0.02
+    LLM_BACKEND=openai LOCAL_LLM_BASE_URL=http://localhost:8080/v1 streamlit run app.py
+"""
+import json
+import time
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPLY = (
+    "Here is your leave balance for this year:\n\n"
+    "**Sick Leave**: 9 days remaining  \n"
+    "**Casual Leave**: 10 days remaining  \n"
+    "**Earned Leave**: 18 days remaining  \n\n"
+    "You have 1 pending leave request awaiting approval."
+)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    token_delay = 0.02
+    model = "stub"
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._json({"object": "list", "data": [{"id": self.model, "object": "model"}]})
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_error(404)
+            return
+
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        words = REPLY.split(" ")
+        tokens = [w if i == len(words) - 1 else w + " " for i, w in enumerate(words)]
+        base = {"id": "chatcmpl-stub", "created": int(time.time()), "model": self.model}
+
+        if not request.get("stream"):
+            time.sleep(self.token_delay * len(tokens))
+            self._json({
+                **base,
+                "object": "chat.completion",
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": REPLY}}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": len(tokens), "total_tokens": len(tokens)},
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        def send(delta, finish_reason=None):
+            chunk = {**base, "object": "chat.completion.chunk",
+                     "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+
+        send({"role": "assistant", "content": ""})
+        for token in tokens:
+            time.sleep(self.token_delay)
+            send({"content": token})
+        send({}, finish_reason="stop")
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--token-delay", type=float, default=0.02, help="seconds between streamed words")
+    args = parser.parse_args()
+
+    StubHandler.token_delay = args.token_delay
+    server = ThreadingHTTPServer((args.host, args.port), StubHandler)
+    print(f"🧪 Stub LLM listening on http://{args.host}:{args.port}/v1 ({args.token_delay}s/token)")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import re
+
+# ---------------------------------------------------------
+# QUICK ACTIONS
+# ---------------------------------------------------------
+# key → (button label, prompt sent to the LLM on "Explain more")
+QUICK_ACTIONS = {
+    "leave": ("📝 Apply Leave", "I want to apply for leave. Show leave application steps."),
+    "salary": ("📄 Salary Details", "Show my salary details."),
+    "goals": ("🎯 My Goals", "Show my goals and performance."),
+    "assets": ("🛠 IT Assets", "Show all IT assets assigned to me."),
+    "policies": ("🗂 HR Policies", "Show me all HR policies."),
+}
+
+
+def _money(value):
+    return "—" if value is None else f"₹{value:,.0f}"
+
+
+# ---------------------------------------------------------
+# PER-EMPLOYEE CARDS (built once at login from the profile)
+# ---------------------------------------------------------
+def _leave_card(profile, aggregates):
+    lines = ["**Leave balance**", ""]
+
+    balance = (aggregates or {}).get("leave_balance")
+    if balance:
+        lines += [
+            f"| Type ({balance['year']}) | Entitlement | Taken | Pending | Remaining |",
+            "|---|---|---|---|---|",
+        ]
+        for leave_type, entry in balance["by_type"].items():
+            lines.append(
+                f"| {leave_type} | {entry['entitlement'] if entry['entitlement'] is not None else '—'} "
+                f"| {entry['taken']} | {entry['pending']} | {entry.get('remaining', '—')} |"
+            )
+        lines += ["", f"**Pending requests**: {balance['pending_requests']}"]
+    else:
+        lines.append("No leave balance is available for your profile.")
+
+    lines += ["", "Use **Explain more** for the leave application steps from the policy."]
+    return "\n".join(lines)
+
+
+def _salary_card(profile, aggregates):
+    salary = profile.get("salary") or {}
+    if salary.get("ctc") is None:
+        return "No salary record is available for your profile."
+
+    return "\n".join([
+        "**Salary details**",
+        "",
+        f"**CTC**: {_money(salary.get('ctc'))}  ",
+        f"**Basic Pay**: {_money(salary.get('basic_pay'))}  ",
+        f"**HRA**: {_money(salary.get('hra'))}  ",
+        f"**PF**: {_money(salary.get('pf'))}  ",
+        f"**ESI**: {_money(salary.get('esi'))}  ",
+        f"**Tax Deduction**: {_money(salary.get('tax_deduction'))}  ",
+    ])
+
+
+def _goals_card(profile, aggregates):
+    goals = profile.get("goals") or []
+    if not goals:
+        return "No goals are assigned to you yet."
+
+    lines = ["**Your goals**", ""]
+    summary = (aggregates or {}).get("goals")
+    if summary and summary["total"]:
+        lines += [f"**Completed**: {summary['completed']}/{summary['total']}", ""]
+
+    for goal in goals:
+        lines.append(f"- **{goal['goal_title']}** — {goal['status']} (due {goal['due_date']})")
+    return "\n".join(lines)
+
+
+def _assets_card(profile, aggregates):
+    assets = profile.get("assets") or []
+    if not assets:
+        return "No IT assets are assigned to you."
+
+    lines = ["**Assigned IT assets**", "", "| Asset | Serial | Issued | Status |", "|---|---|---|---|"]
+    for asset in assets:
+        lines.append(f"| {asset['asset_type']} | {asset['serial_number']} | {asset['issue_date']} | {asset['status']} |")
+    return "\n".join(lines)
+
+
+def build_employee_cards(profile, aggregates=None):
+    """Deterministic quick-action answers for one employee."""
+    return {
+        "leave": _leave_card(profile, aggregates),
+        "salary": _salary_card(profile, aggregates),
+        "goals": _goals_card(profile, aggregates),
+        "assets": _assets_card(profile, aggregates),
+    }
+
+
+# ---------------------------------------------------------
+# POLICY SUMMARY CARD (built once per index version)
+# ---------------------------------------------------------
+_NUMBERED_HEADING = re.compile(r"^(\d+(\.\d+)*)[.)]?\s+[A-Z][\w &/,'()-]{2,80}$")
+
+
+def extract_headings(text):
+    """Heading-like lines: numbered titles, or short ALL CAPS / Title Case lines."""
+    headings = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or len(line) > 80 or line.endswith((".", ",", ";", ":")):
+            continue
+
+        words = line.split()
+        if _NUMBERED_HEADING.match(line):
+            headings.append(line)
+        elif 1 <= len(words) <= 8 and (line.isupper() or all(w[0].isupper() for w in words if w[0].isalpha())):
+            headings.append(line)
+    return headings
+
+
+def build_policy_card(chunks, limit=25):
+    """Table of contents of the indexed policy document."""
+    seen, keys = [], set()
+    for chunk in chunks:
+        for heading in extract_headings(chunk.page_content):
+            if heading.lower() not in keys:
+                keys.add(heading.lower())
+                seen.append(heading)
+
+    if not seen:
+        return "The policy handbook is indexed. Use **Explain more** for a summary."
+
+    lines = ["**HR policy handbook — sections**", ""]
+    lines += [f"- {heading}" for heading in seen[:limit]]
+    if len(seen) > limit:
+        lines.append(f"- … and {len(seen) - limit} more")
+    lines += ["", "Ask about any section, or use **Explain more** for a summary."]
+    return "\n".join(lines)
@@ -0,0 +1,130 @@
+import json
+import threading
+from collections import OrderedDict
+
+# ---------------------------------------------------------
+# COMPACT PROMPT SERIALIZATION
+# ---------------------------------------------------------
+# The LLM reads employee data as indented `key: value` lines. Lists of
+# records become TOON-style tables, so field names appear once per list
+# instead of once per row:
+#
+#   leave_history[2]{leave_type,start_date,end_date,status}:
+#     Sick Leave,2025-03-02,2025-03-04,Approved
+#     Casual Leave,2025-01-10,2025-01-10,Pending
+#
+# None / empty values are dropped; a blank cell in a table means "no value".
+
+INDENT = "  "
+
+# Formatted profiles, keyed by (employee_code, snapshot version).
+PROFILE_CACHE_SIZE = 1024
+
+_profile_cache = OrderedDict()
+_profile_cache_lock = threading.Lock()
+
+
+def _is_empty(value):
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _scalar(value):
+    if isinstance(value, bool):
+        return "yes" if value else "no"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _cell(value):
+    """A table cell; quoted only when it would break the row."""
+    if value is None:
+        return ""
+    text = _scalar(value)
+    if any(ch in text for ch in ',"\n') or text != text.strip():
+        return json.dumps(text, ensure_ascii=False)
+    return text
+
+
+def _is_table(value):
+    return isinstance(value, list) and value and all(isinstance(row, dict) for row in value)
+
+
+def _is_keyed_table(value):
+    """A mapping of name → record, e.g. leave balance by type."""
+    return isinstance(value, dict) and value and all(isinstance(row, dict) for row in value.values())
+
+
+def _table(key, rows, depth, name_column=None):
+    columns = []
+    for row in rows.values() if name_column else rows:
+        for column, value in row.items():
+            if column not in columns and not _is_empty(value):
+                columns.append(column)
+
+    header = ([name_column] if name_column else []) + columns
+    pad = INDENT * depth
+    lines = [f"{pad}{key}[{len(rows)}]{{{','.join(header)}}}:"]
+
+    if name_column:
+        records = [[name] + [row.get(c) for c in columns] for name, row in rows.items()]
+    else:
+        records = [[row.get(c) for c in columns] for row in rows]
+
+    lines += [pad + INDENT + ",".join(_cell(v) for v in record) for record in records]
+    return lines
+
+
+def _lines(key, value, depth):
+    pad = INDENT * depth
+
+    if _is_table(value):
+        return _table(key, value, depth)
+
+    if _is_keyed_table(value):
+        return _table(key, value, depth, name_column="name")
+
+    if isinstance(value, dict):
+        lines = []
+        for child_key, child in value.items():
+            if not _is_empty(child):
+                lines += _lines(child_key, child, depth + 1)
+        return [f"{pad}{key}:"] + lines if lines else []
+
+    if isinstance(value, list):
+        items = [_cell(item) for item in value if not _is_empty(item)]
+        return [f"{pad}{key}[{len(items)}]: {','.join(items)}"] if items else []
+
+    return [f"{pad}{key}: {_scalar(value)}"]
+
+
+def format_context(context):
+    """Compact text for a dict of prompt context (profile, summary, lists)."""
+    lines = []
+    for key, value in context.items():
+        if not _is_empty(value):
+            lines += _lines(key, value, 0)
+    return "\n".join(lines)
+
+
+def format_profile(profile, cache_key=None):
+    """
+    `format_context` for a profile, memoized per `cache_key`
+    ((employee_code, snapshot version)); a new version formats afresh.
+    """
+    if cache_key is None:
+        return format_context(profile)
+
+    with _profile_cache_lock:
+        text = _profile_cache.get(cache_key)
+        if text is not None:
+            _profile_cache.move_to_end(cache_key)
+            return text
+
+    text = format_context(profile)
+
+    with _profile_cache_lock:
+        _profile_cache[cache_key] = text
+        if len(_profile_cache) > PROFILE_CACHE_SIZE:
+            _profile_cache.popitem(last=False)
+    return text
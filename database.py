@@ -1,9 +1,16 @@
 import os
-from sqlalchemy import create_engine, text
+import time
+import logging
+import threading
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker, declarative_base, scoped_session
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.pool import QueuePool
 from dotenv import load_dotenv
 
+import metrics
+from metrics import track_pool
+
 # ---------------------------
 # Load .env Config
 # ---------------------------
@@ -14,19 +21,30 @@ DATABASE_URL = os.getenv("SUPABASE_DB_URL")
 if not DATABASE_URL:
     raise ValueError("❌ SUPABASE_DB_URL not found in .env file")
 
+# Optional read replicas (comma-separated URLs) for read-only ESS traffic.
+REPLICA_URLS = [u.strip() for u in os.getenv("SUPABASE_DB_REPLICA_URLS", "").split(",") if u.strip()]
+
+# How long a replica health result is trusted before re-checking.
+REPLICA_HEALTH_INTERVAL = float(os.getenv("DB_REPLICA_HEALTH_INTERVAL", "15"))
+
 
 # ---------------------------
 # Create SQLAlchemy Engine
 # ---------------------------
+POOL_SIZE = 5
+MAX_OVERFLOW = 10
+
 engine = create_engine(
     DATABASE_URL,
     poolclass=QueuePool,
-    pool_size=5,
-    max_overflow=10,
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
     pool_timeout=30,
     echo=False
 )
 
+track_pool(engine, POOL_SIZE, MAX_OVERFLOW)
+
 
 # ---------------------------
 # Session Local (Thread Safe)
@@ -36,6 +54,126 @@ SessionLocal = scoped_session(
 )
 
 
+# ---------------------------
+# Read Replica Routing
+# ---------------------------
+class ReplicaRouter:
+    """
+    Picks an engine for read-only work: healthy replicas in round-robin,
+    falling back to the primary when none are reachable. Health is a
+    cached `SELECT 1`; a replica that fails a query is marked down and
+    re-checked after REPLICA_HEALTH_INTERVAL.
+    """
+
+    def __init__(self, primary, replica_urls, health_interval=REPLICA_HEALTH_INTERVAL):
+        self.primary = primary
+        self.replicas = [
+            create_engine(
+                url,
+                poolclass=QueuePool,
+                pool_size=POOL_SIZE,
+                max_overflow=MAX_OVERFLOW,
+                pool_timeout=5,
+                pool_pre_ping=True,
+                echo=False,
+            )
+            for url in replica_urls
+        ]
+        for replica in self.replicas:
+            event.listen(replica, "handle_error", self._tag_error)
+        self.health_interval = health_interval
+        self._health = {}  # engine → (healthy, checked_at)
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _tag_error(context):
+        # Remember which replica raised, so callers only blame it for its own errors.
+        if context.sqlalchemy_exception is not None:
+            context.sqlalchemy_exception.replica = context.engine
+
+    def _ping(self, replica):
+        try:
+            with replica.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            return True
+        except Exception as e:
+            logging.warning(f"Read replica {replica.url.render_as_string()} unhealthy: {e}")
+            return False
+
+    def is_healthy(self, replica):
+        healthy, checked_at = self._health.get(replica, (None, 0.0))
+        if healthy is None or time.monotonic() - checked_at > self.health_interval:
+            healthy = self._ping(replica)
+            self._health[replica] = (healthy, time.monotonic())
+        return healthy
+
+    def mark_unhealthy(self, replica):
+        if replica is not self.primary:
+            self._health[replica] = (False, time.monotonic())
+
+    def healthy_count(self):
+        return sum(1 for healthy, _ in self._health.values() if healthy)
+
+    def read_engine(self):
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % max(len(self.replicas), 1)
+
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if self.is_healthy(replica):
+                return replica
+
+        return self.primary
+
+
+router = ReplicaRouter(engine, REPLICA_URLS)
+metrics.DB_REPLICAS_HEALTHY.set_function(router.healthy_count)
+
+_ReadSession = sessionmaker(autocommit=False, autoflush=False)
+
+
+def ReadSessionLocal():
+    """
+    Session for read-only work (logins, profile fetches, aggregates).
+    Bound to a healthy replica, or the primary if there are none.
+    Never write through it: replicas reject writes.
+    """
+    return _ReadSession(bind=router.read_engine())
+
+
+def run_read(work):
+    """
+    Run `work(db)` on a read session, failing over to the next replica
+    (and finally the primary) if the chosen one errors mid-query. Errors
+    from other connections `work` uses (e.g. a primary session for
+    writes) are raised without touching replica health.
+    """
+    attempts = len(router.replicas) + 1
+    for attempt in range(attempts):
+        db = ReadSessionLocal()
+        bind = db.get_bind()
+        try:
+            return work(db)
+        except OperationalError as e:
+            if getattr(e, "replica", None) is not bind or attempt == attempts - 1:
+                raise
+            router.mark_unhealthy(bind)
+        finally:
+            db.close()
+
+
+def dispose_pools_after_fork():
+    """
+    Forget pooled connections inherited from a parent process, without
+    closing them (they belong to the parent). Call first thing in a forked
+    worker; each worker then opens its own connections.
+    """
+    for pooled_engine in [engine, *router.replicas]:
+        pooled_engine.dispose(close=False)
+
+
 # ---------------------------
 # Base ORM Class
 # ---------------------------
@@ -66,6 +204,10 @@ def test_connection():
         print("❌ Database connection failed:", e)
         raise e
 
+    for replica in router.replicas:
+        status = "✅ healthy" if router.is_healthy(replica) else "❌ unreachable"
+        print(f"Read replica {replica.url.render_as_string()}: {status}")
+
 
 if __name__ == "__main__":
     test_connection()
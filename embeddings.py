@@ -0,0 +1,170 @@
+import os
+import logging
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# ---------------------------
+# Config
+# ---------------------------
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# torch (default) | onnx | onnx-int8
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", "data/onnx/all-MiniLM-L6-v2")
+ONNX_FILE = "model.onnx"
+ONNX_INT8_FILE = "model.int8.onnx"
+
+# CPU threads per process for inference (0 = library default, all cores).
+# With several worker processes per node, set cores / workers.
+EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", "0"))
+
+# Same limit sentence-transformers uses for this model.
+MAX_SEQ_LENGTH = 256
+
+
+# ---------------------------------------------------------
+# ONNX Runtime backend
+# ---------------------------------------------------------
+class OnnxMiniLMEmbeddings(Embeddings):
+    """
+    all-MiniLM-L6-v2 on ONNX Runtime (CPU), without importing torch.
+
+    Mirrors the sentence-transformers pipeline (mean pooling over the
+    attention mask + L2 normalisation), so vectors stay compatible with
+    an index built by the torch backend.
+    """
+
+    def __init__(self, model_dir: str = ONNX_MODEL_DIR, quantized: bool = False, batch_size: int = 32):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_file = ONNX_INT8_FILE if quantized else ONNX_FILE
+        model_path = os.path.join(model_dir, model_file)
+        if not os.path.isfile(model_path):
+            raise FileNotFoundError(
+                f"{model_path} not found; run `python embeddings.py --export"
+                f"{' --quantize' if quantized else ''}` first"
+            )
+
+        self.batch_size = batch_size
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=MAX_SEQ_LENGTH)
+        self.tokenizer.enable_padding(pad_id=0, pad_token="[PAD]")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if EMBEDDING_THREADS:
+            options.intra_op_num_threads = EMBEDDING_THREADS
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def _embed_batch(self, texts):
+        encodings = self.tokenizer.encode_batch(texts)
+
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean pooling over real tokens, then L2 normalise.
+        mask = attention_mask[..., None].astype(np.float32)
+        summed = (token_embeddings * mask).sum(axis=1)
+        counts = np.clip(mask.sum(axis=1), 1e-9, None)
+        pooled = summed / counts
+        norms = np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return (pooled / norms).astype(np.float32)
+
+    def embed_documents(self, texts):
+        vectors = []
+        for i in range(0, len(texts), self.batch_size):
+            vectors.extend(self._embed_batch(texts[i:i + self.batch_size]).tolist())
+        return vectors
+
+    def embed_query(self, text):
+        return self._embed_batch([text])[0].tolist()
+
+
+# ---------------------------------------------------------
+# Backend selection
+# ---------------------------------------------------------
+def create_embeddings(backend: str = EMBEDDING_BACKEND):
+    """Build the embedding object for the configured backend."""
+    if backend == "torch":
+        from langchain_community.embeddings import HuggingFaceEmbeddings
+
+        if EMBEDDING_THREADS:
+            import torch
+            torch.set_num_threads(EMBEDDING_THREADS)
+
+        return HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
+
+    if backend in ("onnx", "onnx-int8"):
+        return OnnxMiniLMEmbeddings(quantized=backend == "onnx-int8")
+
+    raise ValueError(f"Unknown EMBEDDING_BACKEND '{backend}' (expected torch, onnx or onnx-int8)")
+
+
+# ---------------------------------------------------------
+# One-off export (needs torch + transformers, not needed at runtime)
+# ---------------------------------------------------------
+def export_onnx_model(model_dir: str = ONNX_MODEL_DIR, quantize: bool = False):
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    os.makedirs(model_dir, exist_ok=True)
+    model_path = os.path.join(model_dir, ONNX_FILE)
+
+    tokenizer = AutoTokenizer.from_pretrained(EMBEDDING_MODEL)
+    model = AutoModel.from_pretrained(EMBEDDING_MODEL).eval()
+    tokenizer.save_pretrained(model_dir)  # writes tokenizer.json
+
+    dummy = tokenizer(["Axis export"], return_tensors="pt")
+    dynamic = {0: "batch", 1: "sequence"}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (dummy["input_ids"], dummy["attention_mask"], dummy["token_type_ids"]),
+            model_path,
+            input_names=["input_ids", "attention_mask", "token_type_ids"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": dynamic,
+                "attention_mask": dynamic,
+                "token_type_ids": dynamic,
+                "last_hidden_state": dynamic,
+            },
+            opset_version=14,
+        )
+    logging.info(f"Exported {EMBEDDING_MODEL} to {model_path}")
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        int8_path = os.path.join(model_dir, ONNX_INT8_FILE)
+        quantize_dynamic(model_path, int8_path, weight_type=QuantType.QInt8)
+        logging.info(f"Wrote int8 model to {int8_path}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Export all-MiniLM-L6-v2 to ONNX.")
+    parser.add_argument("--export", action="store_true", help="export the ONNX model")
+    parser.add_argument("--quantize", action="store_true", help="also write an int8 model")
+    parser.add_argument("--model-dir", default=ONNX_MODEL_DIR)
+    args = parser.parse_args()
+
+    if args.export:
+        export_onnx_model(args.model_dir, quantize=args.quantize)
+    else:
+        parser.print_help()
@@ -1,5 +1,10 @@
+import os
+
 import streamlit as st
 
+import admission
+from streaming import coalesce_stream
+
 def load_theme():
     st.markdown("""
     <style>
@@ -107,43 +112,191 @@ def load_theme():
 
 
 
+# Messages rendered as chat bubbles on every rerun; older ones collapse
+# into a paginated "earlier messages" block so render cost stays flat.
+CHAT_RENDER_WINDOW = int(os.getenv("CHAT_RENDER_WINDOW", "6"))
+CHAT_RENDER_PAGE_SIZE = int(os.getenv("CHAT_RENDER_PAGE_SIZE", "10"))
+
+
+def _escape_markdown(text):
+    """`$` is escaped so salary figures are not rendered as LaTeX."""
+    return text.replace("$", "\\$")
+
+
+def _prepare_markdown(content):
+    """Markdown for a stored message as it is sent to the browser."""
+    return _escape_markdown((content or "").strip())
+
+
+def _escaped_stream(chunks, raw):
+    """Escape streamed chunks like stored messages; collect the raw text in `raw`."""
+    for chunk in chunks:
+        raw.append(chunk)
+        yield _escape_markdown(chunk)
+
+
+def _oldest_message_id(*message_lists):
+    """Cursor for the next "load earlier" page: smallest persisted id shown."""
+    ids = [m["id"] for messages in message_lists for m in messages if m.get("id") is not None]
+    return min(ids) if ids else None
+
+
 class AssistantGUI:
-    def __init__(self, assistant):
+    def __init__(self, assistant, history_store=None, render_window=CHAT_RENDER_WINDOW):
         self.assistant = assistant
         self.messages = assistant.messages
         self.employee_information = assistant.employee_information
+        self.history_store = history_store
+        self.render_window = render_window
 
     def get_response(self, user_input):
         return self.assistant.get_response(user_input)
 
+    def render_message(self, message):
+        if message["role"] == "user":
+            st.chat_message("human").markdown(_prepare_markdown(message["content"]))
+        elif message["role"] == "ai":
+            st.chat_message("ai").markdown(_prepare_markdown(message["content"]))
+
     def render_messages(self):
-        for message in self.messages:
-            if message["role"] == "user":
-                st.chat_message("human").markdown(message["content"])
-            elif message["role"] == "ai":
-                st.chat_message("ai").markdown(message["content"])
+        """Only the newest `render_window` messages are rendered as bubbles."""
+        for message in self.messages[-self.render_window:]:
+            self.render_message(message)
+
+    def _load_older_page(self, earlier):
+        """Pull the next page from the history store; False once it is exhausted."""
+        if self.history_store is None or st.session_state.get("history_exhausted"):
+            return False
+
+        cursor = _oldest_message_id(earlier, self.messages)
+        page = self.history_store.load_before(cursor) if cursor is not None else []
+        if not page:
+            st.session_state.history_exhausted = True
+            return False
+
+        earlier[:0] = page
+        return True
+
+    def render_earlier_messages(self):
+        """
+        Collapsed, paginated view of everything older than the render window:
+        in-memory messages first, then pages read from the history store
+        only when the user pages back past them.
+        """
+        earlier = st.session_state.setdefault("earlier_messages", [])
+        older = earlier + self.messages[:-self.render_window]
+
+        can_load_more = (
+            self.history_store is not None
+            and not st.session_state.get("history_exhausted")
+            and _oldest_message_id(earlier, self.messages) is not None
+        )
+        if not older and not can_load_more:
+            return
+
+        page = st.session_state.setdefault("history_page", 0)
+        size = CHAT_RENDER_PAGE_SIZE
+
+        with st.expander(f"⬆️ Load earlier messages ({len(older)} loaded)", expanded=page > 0):
+            col_older, col_newer = st.columns(2)
+
+            with col_older:
+                has_older = (page + 1) * size < len(older) or can_load_more
+                if has_older and st.button("◀ Older", key="history_older"):
+                    if (page + 1) * size >= len(older) and self._load_older_page(earlier):
+                        older = earlier + self.messages[:-self.render_window]
+                    if (page + 1) * size < len(older):
+                        page += 1
+
+            with col_newer:
+                if page > 0 and st.button("Newer ▶", key="history_newer"):
+                    page -= 1
+
+            st.session_state.history_page = page
+
+            end = len(older) - page * size
+            for message in older[max(0, end - size):end]:
+                self.render_message(message)
+
+    def save_turn(self, user_message, ai_message):
+        """Append a finished turn to history, persist it and keep memory bounded."""
+        self.messages.extend([user_message, ai_message])
+
+        if self.history_store is not None:
+            self.history_store.append(user_message, ai_message)
+
+            dropped = self.history_store.trim(self.messages)
+            # Keep a scrolled-back view contiguous with the live window.
+            earlier = st.session_state.get("earlier_messages")
+            if dropped and earlier:
+                earlier.extend(dropped)
+
+        self.set_state("messages", self.messages)
 
     def set_state(self, key, value):
         st.session_state[key] = value
 
-    def render_user_input(self):
-        user_input = st.chat_input("Type here...", key="input")
-        if user_input and user_input.strip() != "":
-            st.chat_message("human").markdown(user_input)
+    def render_turn(self, user_input):
+        """Render one new turn in place (no full-page rerun) and save it."""
+        st.session_state.explain_prompt = None
+        st.chat_message("human").markdown(_prepare_markdown(user_input))
+
+        # Rejected before any LLM / DB work: nothing is saved, the user retries.
+        try:
+            with admission.admit_chat(self.assistant.employee_id or self.assistant.employee_code):
+                response_generator = self.get_response(user_input)
+                raw = []
+                with st.chat_message("ai"):
+                    st.write_stream(_escaped_stream(coalesce_stream(response_generator), raw))
+                response = "".join(raw)
+        except admission.Rejected as e:
+            st.warning(f"⏳ {e}")
+            return
+
+        # Save to chat history
+        self.save_turn(
+            {"role": "user", "content": user_input},
+            {"role": "ai", "content": response},
+        )
+
+    def render_card(self, label, card, explain_prompt):
+        """A quick-action answer rendered instantly from a precomputed card."""
+        # No LLM call, but the turn is still written: a cheaper rate limit.
+        try:
+            admission.admit_card(self.assistant.employee_id or self.assistant.employee_code)
+        except admission.Rejected as e:
+            st.warning(f"⏳ {e}")
+            return
+
+        st.chat_message("human").markdown(_prepare_markdown(label))
+        st.chat_message("ai").markdown(_prepare_markdown(card))
 
-            response_generator = self.get_response(user_input)
-            with st.chat_message("ai"):
-                response = st.write_stream(response_generator)
+        self.save_turn(
+            {"role": "user", "content": label},
+            {"role": "ai", "content": card},
+        )
+        st.session_state.explain_prompt = explain_prompt
 
-            # Save to chat history
-            self.messages.append({"role": "user", "content": user_input})
-            self.messages.append({"role": "ai", "content": response})
+    def render_explain_more(self):
+        """Offer the full LLM answer for the last card until something else is asked."""
+        explain_prompt = st.session_state.get("explain_prompt")
+        if explain_prompt and st.button("💬 Explain more", key="explain_more"):
+            self.render_turn(explain_prompt)
 
-            self.set_state("messages", self.messages)
+    def render_user_input(self):
+        user_input = st.chat_input("Type here...", key="input")
+        if user_input and user_input.strip() != "":
+            self.render_turn(user_input)
 
-    def render(self):
+    def render(self, quick_card=None):
         load_theme()
 
         # CHAT BODY
+        self.render_earlier_messages()
         self.render_messages()
+
+        if quick_card:
+            self.render_card(*quick_card)
+        self.render_explain_more()
+
         self.render_user_input()
@@ -0,0 +1,164 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+import metrics
+from index_refresher import INDEX_REFRESH_INTERVAL
+from vector_index import MANIFEST_FILE
+
+# ---------------------------
+# Config
+# ---------------------------
+# Versions kept on disk, newest first (the current one included). Older
+# ones are deleted once a newer version is published; keeping the
+# previous one gives other worker processes time to follow the pointer.
+KEEP_INDEX_VERSIONS = int(os.getenv("KEEP_INDEX_VERSIONS", "2"))
+
+# A superseded version is deleted only after this many seconds. Other
+# workers follow the pointer every INDEX_REFRESH_INTERVAL, so until then
+# one of them may still be serving it.
+INDEX_RETIRE_GRACE = float(os.getenv("INDEX_RETIRE_GRACE", str(3 * INDEX_REFRESH_INTERVAL)))
+
+VERSIONS_DIR = "versions"
+CURRENT_LINK = "current"
+
+
+# ---------------------------------------------------------
+# ON-DISK LAYOUT (blue/green)
+# ---------------------------------------------------------
+#   <root>/versions/v1718000000123-3fa2c1d9/   one complete index per build (ms timestamp)
+#   <root>/current -> versions/v1718000000123-3fa2c1d9
+#
+# A build writes into a fresh version directory that nothing reads, is
+# validated, and is then published by atomically replacing the `current`
+# symlink. Readers never see a half-written index.
+def version_path(root, version):
+    return os.path.join(root, VERSIONS_DIR, version)
+
+
+def current_version(root):
+    try:
+        return os.path.basename(os.readlink(os.path.join(root, CURRENT_LINK)))
+    except OSError:
+        return None
+
+
+def new_version_name(manifest):
+    digest = hashlib.sha1(json.dumps(manifest, sort_keys=True).encode("utf-8")).hexdigest()[:8]
+    return f"v{time.time_ns() // 1_000_000}-{digest}"
+
+
+def publish(root, version):
+    """Point `current` at `version` in one atomic rename."""
+    tmp = os.path.join(root, f".{CURRENT_LINK}-{os.getpid()}")
+    if os.path.lexists(tmp):
+        os.remove(tmp)
+    os.symlink(os.path.join(VERSIONS_DIR, version), tmp)
+    os.replace(tmp, os.path.join(root, CURRENT_LINK))
+    logging.info(f"Published policy index {version}")
+
+
+def retire_old_versions(root, keep=KEEP_INDEX_VERSIONS, grace=INDEX_RETIRE_GRACE):
+    """
+    Delete complete versions beyond the newest `keep` once they were
+    superseded more than `grace` seconds ago, and leftovers of failed
+    builds (no manifest) older than `grace`. Never the current one.
+    Call under the index lock, so no build is in progress.
+    """
+    versions_dir = os.path.join(root, VERSIONS_DIR)
+    try:
+        versions = sorted(os.listdir(versions_dir), reverse=True)
+    except OSError:
+        return
+
+    def _manifest_mtime(version):
+        try:
+            return os.path.getmtime(os.path.join(versions_dir, version, MANIFEST_FILE))
+        except OSError:
+            return None
+
+    now = time.time()
+    current = current_version(root)
+    published = [v for v in versions if _manifest_mtime(v) is not None]
+    retired = []
+
+    # A version stopped being served when the next newer one was published.
+    for i, version in enumerate(published[max(keep, 1):], start=max(keep, 1)):
+        if version != current and now - _manifest_mtime(published[i - 1]) >= grace:
+            retired.append(version)
+
+    for version in set(versions) - set(published):
+        path = os.path.join(versions_dir, version)
+        if version != current and now - os.path.getmtime(path) >= grace:
+            retired.append(version)
+
+    for version in retired:
+        shutil.rmtree(os.path.join(versions_dir, version), ignore_errors=True)
+        logging.info(f"Retired policy index {version}")
+
+
+# ---------------------------------------------------------
+# IN-PROCESS HANDLE (swap + drain)
+# ---------------------------------------------------------
+class PolicyIndex:
+    """
+    The policy vector store a process serves queries from. Queries run
+    inside `acquire()`, which pins the version that was current when they
+    started; `switch_to` opens the new version before swapping, so no
+    query waits on a load, and an old version is dropped only once its
+    last in-flight query has finished.
+    """
+
+    def __init__(self, root, open_version):
+        self.root = root
+        self._open_version = open_version  # version directory → vector store
+        self._lock = threading.Lock()
+        self._stores = {}
+        self._inflight = defaultdict(int)
+        self.version = None
+
+    def switch_to(self, version):
+        if version == self.version:
+            return
+
+        store = self._open_version(version_path(self.root, version))
+
+        with self._lock:
+            previous, self.version = self.version, version
+            self._stores[version] = store
+            self._drop_if_drained(previous)
+
+        if previous is not None:
+            metrics.INDEX_SWAPS.inc()
+        logging.info(f"Serving policy index {version} (was {previous})")
+
+    def follow_pointer(self):
+        """Switch to whatever `current` points at (another process may have published)."""
+        version = current_version(self.root)
+        if version is not None:
+            self.switch_to(version)
+        return version
+
+    @contextmanager
+    def acquire(self):
+        with self._lock:
+            version = self.version
+            store = self._stores[version]
+            self._inflight[version] += 1
+        try:
+            yield store
+        finally:
+            with self._lock:
+                self._inflight[version] -= 1
+                self._drop_if_drained(version)
+
+    def _drop_if_drained(self, version):
+        if version is not None and version != self.version and self._inflight[version] <= 0:
+            self._stores.pop(version, None)
+            self._inflight.pop(version, None)
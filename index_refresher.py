@@ -0,0 +1,96 @@
+import os
+import time
+import logging
+import threading
+
+import metrics
+
+# ---------------------------
+# Config
+# ---------------------------
+# How often the policy source is checked for changes (seconds).
+INDEX_REFRESH_INTERVAL = float(os.getenv("INDEX_REFRESH_INTERVAL", "60"))
+
+# Rebuild even without a source change this often (seconds, 0 = only on change).
+INDEX_REBUILD_INTERVAL = float(os.getenv("INDEX_REBUILD_INTERVAL", "0"))
+
+
+# ---------------------------------------------------------
+# BACKGROUND INDEX REFRESH
+# ---------------------------------------------------------
+class IndexRefresher:
+    """
+    Keeps the policy index current without touching the request path.
+
+    Every INDEX_REFRESH_INTERVAL it stats the policy PDF; when size or
+    mtime moved (or a scheduled rebuild is due) it rebuilds through
+    `build_index_version`, which compares the content hash, so a touch or
+    re-copy reuses the current version. Otherwise it just follows the
+    `current` pointer, picking up versions published by other workers.
+    Failures are logged and counted; the previous version keeps serving.
+    """
+
+    def __init__(self, pdf_path: str, interval: float = INDEX_REFRESH_INTERVAL,
+                 rebuild_interval: float = INDEX_REBUILD_INTERVAL):
+        self.pdf_path = pdf_path
+        self.interval = interval
+        self.rebuild_interval = rebuild_interval
+        self.last_refresh_at = None
+        self.last_duration = None
+        self.last_error = None
+        self._last_stat = None
+        self._last_build = time.monotonic()
+        self._stop = threading.Event()
+
+    def start(self):
+        thread = threading.Thread(target=self._run, name="axis-index-refresh", daemon=True)
+        thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _source_stat(self):
+        stat = os.stat(self.pdf_path)
+        return stat.st_size, stat.st_mtime
+
+    def refresh(self, scheduled: bool = False):
+        """One check; builds and swaps in a new version if needed."""
+        from resources import build_index_version, init_vector_store, load_embedding
+
+        index = init_vector_store(self.pdf_path)
+        if index is None:
+            # The first load failed and its None is cached; retry it here.
+            init_vector_store.clear()
+            index = init_vector_store(self.pdf_path)
+            if index is None:
+                raise RuntimeError("policy index is not initialized")
+
+        source_stat = self._source_stat()
+        if not scheduled and source_stat == self._last_stat:
+            index.follow_pointer()
+            return
+
+        start = time.perf_counter()
+        max_age = self.rebuild_interval if scheduled else None
+        index.switch_to(build_index_version(self.pdf_path, load_embedding(), max_age=max_age))
+        self._last_stat = source_stat
+
+        self.last_duration = time.perf_counter() - start
+        self.last_refresh_at = time.time()
+        metrics.INDEX_LAST_REFRESH_SECONDS.set(self.last_duration)
+        metrics.INDEX_LAST_REFRESH_TIMESTAMP.set(self.last_refresh_at)
+        logging.info(f"Policy index refreshed in {self.last_duration:.2f}s ({index.version})")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            due = self.rebuild_interval > 0 and time.monotonic() - self._last_build >= self.rebuild_interval
+            try:
+                self.refresh(scheduled=due)
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+                metrics.INDEX_REFRESH_ERRORS.inc()
+                logging.warning(f"Policy index refresh failed: {e}")
+            if due:
+                self._last_build = time.monotonic()
@@ -0,0 +1,51 @@
+import time
+import logging
+import importlib
+import threading
+
+# ---------------------------
+# Heavy modules (ML stack + DB)
+# ---------------------------
+# None of these are needed to render the login screen. They are imported
+# on first use, or warmed by the warm-up stage while the user types.
+HEAVY_MODULES = [
+    "langchain_core.prompts",
+    "langchain_text_splitters",
+    "langchain_community.document_loaders",
+    "langchain_community.vectorstores",
+    "langchain_groq",
+    "embeddings",
+    "database",
+    "services.profile_snapshot_service",
+    "services.chat_history_service",
+    "services.aggregates_service",
+    "services.history_service",
+    "services.team_service",
+    "assistant",
+]
+
+IMPORT_TIMINGS = {}
+_timings_lock = threading.Lock()
+
+
+def timed_import(module_name: str):
+    """Import a module, recording how long the first import took."""
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    elapsed = time.perf_counter() - start
+
+    with _timings_lock:
+        # Only the first (cold) import is interesting; later calls hit sys.modules.
+        IMPORT_TIMINGS.setdefault(module_name, elapsed)
+
+    return module
+
+
+def log_import_timings():
+    with _timings_lock:
+        timings = sorted(IMPORT_TIMINGS.items(), key=lambda item: item[1], reverse=True)
+
+    total = sum(elapsed for _, elapsed in timings)
+    logging.info(f"Import timings ({total:.2f}s total):")
+    for module_name, elapsed in timings:
+        logging.info(f"  {elapsed:7.3f}s  {module_name}")
@@ -0,0 +1,80 @@
+import os
+import threading
+
+from lazy_imports import timed_import
+
+# ---------------------------
+# Config
+# ---------------------------
+# groq (hosted, default) | openai (any OpenAI-compatible server: llama.cpp
+# `llama-server`, vLLM, or benchmarks/stub_llm_server.py for load tests)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "groq")
+
+GROQ_MODEL = "llama-3.1-8b-instant"
+
+LOCAL_LLM_BASE_URL = os.getenv("LOCAL_LLM_BASE_URL", "http://localhost:8080/v1")
+LOCAL_LLM_MODEL = os.getenv("LOCAL_LLM_MODEL", "local-model")
+LOCAL_LLM_API_KEY = os.getenv("LOCAL_LLM_API_KEY", "not-needed")
+LOCAL_LLM_TIMEOUT = float(os.getenv("LOCAL_LLM_TIMEOUT", "120"))
+
+# Generations in flight per process (0 = unlimited). For a local server,
+# match its parallel slots (llama.cpp --parallel, vLLM --max-num-seqs) so
+# requests queue here instead of timing out there.
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "0"))
+
+# Fixed sampling seed (and temperature 0) for reproducible load tests.
+LLM_SEED = os.getenv("LLM_SEED")
+
+
+# ---------------------------
+# Backends
+# ---------------------------
+def create_llm(backend: str = LLM_BACKEND):
+    """Chat model for the configured backend; all of them stream through `.stream()`."""
+    if backend == "groq":
+        ChatGroq = timed_import("langchain_groq").ChatGroq
+        return ChatGroq(model=GROQ_MODEL)
+
+    if backend == "openai":
+        ChatOpenAI = timed_import("langchain_openai").ChatOpenAI
+        deterministic = {"seed": int(LLM_SEED), "temperature": 0} if LLM_SEED else {}
+        return ChatOpenAI(
+            model=LOCAL_LLM_MODEL,
+            base_url=LOCAL_LLM_BASE_URL,
+            api_key=LOCAL_LLM_API_KEY,
+            timeout=LOCAL_LLM_TIMEOUT,
+            max_retries=1,
+            **deterministic,
+        )
+
+    raise ValueError(f"Unknown LLM_BACKEND '{backend}' (expected groq or openai)")
+
+
+# ---------------------------
+# Concurrency + batching
+# ---------------------------
+_slots = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY) if LLM_MAX_CONCURRENCY > 0 else None
+
+
+def limit_concurrency(chunks):
+    """
+    Hold one generation slot for as long as a response streams. The slot
+    is taken on the first chunk and released when the stream is exhausted
+    or closed, so abandoned responses don't leak it.
+    """
+    if _slots is None:
+        yield from chunks
+        return
+
+    with _slots:
+        yield from chunks
+
+
+def generate_batch(runnable, inputs):
+    """
+    Run many prompts through the same model (or chain), at most
+    LLM_MAX_CONCURRENCY at a time. Local servers batch the concurrent
+    requests on their side (continuous batching / parallel slots).
+    """
+    config = {"max_concurrency": LLM_MAX_CONCURRENCY} if LLM_MAX_CONCURRENCY > 0 else None
+    return runnable.batch(inputs, config=config)
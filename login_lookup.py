@@ -0,0 +1,157 @@
+import os
+import re
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+import metrics
+from lazy_imports import timed_import
+from shared_cache import shared_cache
+
+# ---------------------------
+# Config
+# ---------------------------
+# How often the set of valid employee codes is reloaded (seconds).
+LOGIN_CODES_REFRESH_INTERVAL = float(os.getenv("LOGIN_CODES_REFRESH_INTERVAL", "300"))
+
+# How often the change notification (see notify_employee_codes_changed) is polled.
+LOGIN_CODES_POLL_INTERVAL = float(os.getenv("LOGIN_CODES_POLL_INTERVAL", "5"))
+
+# Unknown codes are rejected from memory for this long (seconds).
+LOGIN_NEGATIVE_TTL = float(os.getenv("LOGIN_NEGATIVE_TTL", "60"))
+
+GENERATION_KEY = "employee_codes:generation"
+MAX_CODE_LENGTH = 50  # employees.employee_code is String(50)
+MAX_NEGATIVE_ENTRIES = 10_000
+
+_SEPARATORS = re.compile(r"[\s_-]+")
+
+
+def normalize_code(raw):
+    """' emp-001 ' → 'EMP001'; None for input that cannot be a code."""
+    code = _SEPARATORS.sub("", raw or "").upper()
+    return code if 0 < len(code) <= MAX_CODE_LENGTH else None
+
+
+def notify_employee_codes_changed():
+    """Tell every worker on this host to reload the codes now (call after adding employees)."""
+    shared_cache.set(GENERATION_KEY, time.time_ns())
+
+
+# ---------------------------------------------------------
+# IN-MEMORY LOGIN LOOKUP
+# ---------------------------------------------------------
+class LoginLookup:
+    """
+    Answers "is this an employee code?" without touching the database.
+
+    A background thread keeps every valid code in memory (one query per
+    refresh, read from a replica), reloading every
+    LOGIN_CODES_REFRESH_INTERVAL or as soon as the shared-cache
+    generation changes. While that set is fresh it is authoritative:
+    typos and guesses are rejected from memory and remembered for
+    LOGIN_NEGATIVE_TTL. Before the first load, or when refreshes keep
+    failing, input is passed through to the DB as before and misses
+    reported via `mark_unknown` go into the same negative cache.
+    """
+
+    def __init__(self, interval: float = LOGIN_CODES_REFRESH_INTERVAL,
+                 poll_interval: float = LOGIN_CODES_POLL_INTERVAL,
+                 negative_ttl: float = LOGIN_NEGATIVE_TTL):
+        self.interval = interval
+        self.poll_interval = poll_interval
+        self.negative_ttl = negative_ttl
+        self._codes = None  # normalized code → stored code; None until the first load
+        self._loaded_at = 0.0
+        self._generation = None
+        self._negative = OrderedDict()  # normalized code → expires_at, oldest first
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def start(self):
+        thread = threading.Thread(target=self._run, name="axis-login-codes", daemon=True)
+        thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def load(self):
+        """Reload the valid codes (one index-only query)."""
+        database = timed_import("database")
+        select = timed_import("sqlalchemy").select
+        Employee = timed_import("models").Employee
+
+        stored = database.run_read(lambda db: db.execute(select(Employee.employee_code)).scalars().all())
+        codes = {normalize_code(code): code for code in stored if code}
+
+        with self._lock:
+            self._codes, self._loaded_at = codes, time.monotonic()
+            # New hires must not stay negatively cached.
+            for code in [c for c in self._negative if c in codes]:
+                del self._negative[code]
+
+        metrics.LOGIN_CODES.set(len(codes))
+        logging.info(f"Loaded {len(codes)} employee codes for login")
+
+    def _is_fresh(self, now):
+        return self._codes is not None and now - self._loaded_at <= 2 * self.interval
+
+    def _remember_unknown(self, code, now):
+        self._negative[code] = now + self.negative_ttl
+        self._negative.move_to_end(code)
+        while self._negative and (
+            len(self._negative) > MAX_NEGATIVE_ENTRIES or next(iter(self._negative.values())) <= now
+        ):
+            self._negative.popitem(last=False)
+
+    def resolve(self, raw):
+        """
+        The stored employee code to load for a login input, or None when
+        it is known not to exist; neither answer costs a DB round trip.
+        Unverifiable input (no fresh code set) is returned as typed.
+        """
+        code = normalize_code(raw)
+        if code is None:
+            metrics.LOGIN_LOOKUPS.labels("malformed").inc()
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            if self._codes is not None and code in self._codes:
+                metrics.LOGIN_LOOKUPS.labels("valid").inc()
+                return self._codes[code]
+
+            expires_at = self._negative.get(code)
+            if expires_at is not None and expires_at > now:
+                metrics.LOGIN_LOOKUPS.labels("negative_cached").inc()
+                return None
+
+            if self._is_fresh(now):
+                self._remember_unknown(code, now)
+                metrics.LOGIN_LOOKUPS.labels("unknown").inc()
+                return None
+
+        metrics.LOGIN_LOOKUPS.labels("unverified").inc()
+        return raw.strip()
+
+    def mark_unknown(self, raw):
+        """Record a code the DB did not find (unverified path)."""
+        code = normalize_code(raw)
+        if code is not None:
+            with self._lock:
+                self._remember_unknown(code, time.monotonic())
+
+    def _run(self):
+        while True:
+            try:
+                generation = shared_cache.get(GENERATION_KEY)
+                due = self._codes is None or time.monotonic() - self._loaded_at >= self.interval
+                if due or generation != self._generation:
+                    self.load()
+                    self._generation = generation
+            except Exception as e:
+                logging.warning(f"Employee code refresh failed: {e}")
+            if self._stop.wait(self.poll_interval):
+                return
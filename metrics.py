@@ -0,0 +1,255 @@
+import os
+import time
+import logging
+import threading
+
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+
+# ---------------------------
+# Config
+# ---------------------------
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
+
+# A session counts as active if it ran a script in this window.
+SESSION_IDLE_SECONDS = int(os.getenv("METRICS_SESSION_IDLE_SECONDS", "1800"))
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+TOKEN_BUCKETS = (50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000)
+
+
+# ---------------------------
+# LLM Generation
+# ---------------------------
+TIME_TO_FIRST_TOKEN = Histogram(
+    "axis_llm_time_to_first_token_seconds",
+    "Time from request start until the first streamed chunk.",
+    buckets=LATENCY_BUCKETS,
+)
+GENERATION_SECONDS = Histogram(
+    "axis_llm_generation_seconds",
+    "Total time to stream a full response.",
+    buckets=LATENCY_BUCKETS,
+)
+INPUT_TOKENS = Histogram(
+    "axis_llm_input_tokens",
+    "Estimated prompt tokens sent per request.",
+    buckets=TOKEN_BUCKETS,
+)
+OUTPUT_TOKENS = Histogram(
+    "axis_llm_output_tokens",
+    "Estimated completion tokens received per request.",
+    buckets=TOKEN_BUCKETS,
+)
+PROMPT_PREFIX_TOKENS = Gauge(
+    "axis_llm_prompt_prefix_tokens",
+    "Estimated tokens in the static system prompt shared by every request.",
+)
+CONTEXT_TOKENS = Histogram(
+    "axis_llm_context_tokens",
+    "Estimated tokens in the per-request part of the prompt (context + query).",
+    buckets=TOKEN_BUCKETS,
+)
+OUTPUT_TOKENS_PER_SECOND = Histogram(
+    "axis_llm_output_tokens_per_second",
+    "Estimated decode rate from the first streamed chunk to the last.",
+    buckets=(5, 10, 20, 40, 80, 160, 320, 640, 1280),
+)
+STREAM_FLUSHES = Histogram(
+    "axis_stream_flushes",
+    "UI updates sent per response after coalescing streamed chunks.",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500),
+)
+GENERATION_ERRORS = Counter(
+    "axis_llm_errors_total",
+    "Responses that failed while streaming.",
+)
+
+
+# ---------------------------
+# Retrieval + Profiles
+# ---------------------------
+RETRIEVAL_SECONDS = Histogram(
+    "axis_retrieval_seconds",
+    "Policy vector store retrieval latency.",
+    buckets=LATENCY_BUCKETS,
+)
+RETRIEVAL_QUERIES = Counter(
+    "axis_retrieval_queries_total",
+    "Policy retrievals by category pre-filter (all = unfiltered, fallback = filter found nothing).",
+    ["scope"],
+)
+INDEX_SWAPS = Counter(
+    "axis_index_swaps_total",
+    "Times this process switched to a newly published policy index version.",
+)
+INDEX_LAST_REFRESH_TIMESTAMP = Gauge(
+    "axis_index_last_refresh_timestamp_seconds",
+    "Unix time of the last completed background index refresh.",
+)
+INDEX_LAST_REFRESH_SECONDS = Gauge(
+    "axis_index_last_refresh_duration_seconds",
+    "Wall time of the last background index refresh (build + swap).",
+)
+INDEX_REFRESH_ERRORS = Counter(
+    "axis_index_refresh_errors_total",
+    "Background index refreshes that failed (the previous version keeps serving).",
+)
+PROFILE_LOAD_SECONDS = Histogram(
+    "axis_profile_load_seconds",
+    "Employee lookup + full profile load latency.",
+    buckets=LATENCY_BUCKETS,
+)
+LOGIN_LOOKUPS = Counter(
+    "axis_login_lookups_total",
+    "Login codes by in-memory answer (valid, unknown, negative_cached, malformed, unverified = sent to the DB).",
+    ["result"],
+)
+LOGIN_CODES = Gauge(
+    "axis_login_codes",
+    "Valid employee codes held in memory for login lookups.",
+)
+
+
+# ---------------------------
+# DB Pool + Sessions
+# ---------------------------
+DB_POOL_CHECKED_OUT = Gauge(
+    "axis_db_pool_checked_out",
+    "Connections currently checked out of the pool.",
+)
+DB_POOL_CAPACITY = Gauge(
+    "axis_db_pool_capacity",
+    "Maximum connections the pool can hand out (size + overflow).",
+)
+DB_REPLICAS_HEALTHY = Gauge(
+    "axis_db_replicas_healthy",
+    "Read replicas that passed their last health check.",
+)
+ACTIVE_SESSIONS = Gauge(
+    "axis_active_sessions",
+    "Browser sessions that ran a script recently.",
+)
+
+
+
+# ---------------------------
+# Admission Control
+# ---------------------------
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "axis_admission_queue_depth",
+    "Requests waiting for a concurrency slot.",
+    ["gate"],
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    "axis_admission_in_flight",
+    "Requests holding a concurrency slot.",
+    ["gate"],
+)
+ADMISSION_REJECTIONS = Counter(
+    "axis_admission_rejections_total",
+    "Requests turned away (rate_limited, queue_full, queue_timeout).",
+    ["gate", "reason"],
+)
+
+# ---------------------------
+# Warm-up / Readiness
+# ---------------------------
+READY = Gauge(
+    "axis_ready",
+    "1 once the warm-up stage (LLM, embeddings, index) has finished.",
+)
+WARMUP_SECONDS = Gauge(
+    "axis_warmup_seconds",
+    "Wall time of the last warm-up stage.",
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 chars per token) used when the provider does not report usage."""
+    if not text:
+        return 0
+    return max(1, len(text) // 4)
+
+
+def track_pool(engine, pool_size: int, max_overflow: int):
+    """Expose pool saturation for an SQLAlchemy engine."""
+    DB_POOL_CAPACITY.set(pool_size + max_overflow)
+    DB_POOL_CHECKED_OUT.set_function(lambda: engine.pool.checkedout())
+
+
+_sessions_lock = threading.Lock()
+_session_last_seen = {}
+
+
+def mark_session_active(session_id: str):
+    with _sessions_lock:
+        _session_last_seen[session_id] = time.monotonic()
+
+
+def _count_active_sessions():
+    cutoff = time.monotonic() - SESSION_IDLE_SECONDS
+    with _sessions_lock:
+        for session_id, seen in list(_session_last_seen.items()):
+            if seen < cutoff:
+                del _session_last_seen[session_id]
+        return len(_session_last_seen)
+
+
+ACTIVE_SESSIONS.set_function(_count_active_sessions)
+
+
+# ---------------------------
+# Stream Instrumentation
+# ---------------------------
+def observe_stream(chunks):
+    """
+    Wrap a streaming generator and record time-to-first-token,
+    total generation time and output tokens once it is exhausted.
+    """
+    start = time.perf_counter()
+    first = True
+    parts = []
+
+    try:
+        for chunk in chunks:
+            if first:
+                TIME_TO_FIRST_TOKEN.observe(time.perf_counter() - start)
+                first = False
+            parts.append(chunk)
+            yield chunk
+    except Exception:
+        GENERATION_ERRORS.inc()
+        raise
+
+    GENERATION_SECONDS.observe(time.perf_counter() - start)
+    OUTPUT_TOKENS.observe(estimate_tokens("".join(parts)))
+
+
+# ---------------------------
+# Scrape Endpoint
+# ---------------------------
+_server_lock = threading.Lock()
+_server_started = False
+
+
+def start_metrics_server(port: int = None):
+    """Start the Prometheus scrape endpoint once per process (port 0 disables it)."""
+    global _server_started
+
+    # Read at call time: forked workers (serve.py) each get their own port.
+    port = METRICS_PORT if port is None else port
+    if port <= 0:
+        return False
+
+    with _server_lock:
+        if _server_started:
+            return True
+        try:
+            start_http_server(port)
+        except OSError as e:
+            # Another worker on this host already owns the port.
+            logging.warning(f"Metrics endpoint not started on :{port}: {e}")
+            return False
+        _server_started = True
+        logging.info(f"Metrics endpoint listening on :{port}/metrics")
+        return True
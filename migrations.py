@@ -0,0 +1,149 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, select, text
+
+# Base, not models: models.create_tables() imports this module, and a
+# second import of models.py (run as __main__) would redefine its tables.
+from database import Base, engine
+
+# ============================================================
+#  SCHEMA MIGRATIONS
+# ============================================================
+# `models.create_tables()` creates missing tables and then runs these
+# migrations, which upgrade existing ones. Every step is idempotent
+# (existing tables / indexes are skipped). Applied versions are recorded
+# in `schema_migrations`.
+#
+#   python migrations.py        # apply pending migrations
+# ============================================================
+
+_migrations_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    _migrations_metadata,
+    Column("version", String(100), primary_key=True),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def _table_exists(conn, table_name):
+    if inspect(conn).has_table(table_name):
+        return True
+    print(f"   - {table_name} does not exist yet, skipping (create_tables() builds it complete)")
+    return False
+
+
+def _create_model_indexes(conn, table_name, index_names):
+    """Create indexes exactly as declared on the model, skipping existing ones."""
+    if not _table_exists(conn, table_name):
+        return
+
+    table = Base.metadata.tables[table_name]
+    existing = {ix["name"] for ix in inspect(conn).get_indexes(table_name)}
+
+    for index in table.indexes:
+        if index.name in index_names and index.name not in existing:
+            print(f"   + {table_name}.{index.name}")
+            index.create(bind=conn)
+
+
+# ------------------------------------------------------------
+#  0001 — FK + composite indexes on employee child tables
+# ------------------------------------------------------------
+def _0001_child_table_indexes(conn):
+    # The unique index needs one salary row per employee. Never delete
+    # payroll data here: stop and let an operator resolve duplicates.
+    if _table_exists(conn, "employee_salary"):
+        duplicates = conn.execute(text(
+            "SELECT employee_id FROM employee_salary "
+            "GROUP BY employee_id HAVING COUNT(*) > 1 ORDER BY employee_id"
+        )).scalars().all()
+        if duplicates:
+            raise RuntimeError(
+                "employee_salary has several rows for employee_id "
+                f"{', '.join(map(str, duplicates))}; keep one row per employee "
+                "(archive the others) and re-run `python migrations.py`"
+            )
+
+    _create_model_indexes(conn, "employee_salary", {"uq_employee_salary_employee_id"})
+    _create_model_indexes(conn, "leave_records", {"ix_leave_records_employee_id_status"})
+    _create_model_indexes(conn, "skills", {"ix_skills_employee_id"})
+    _create_model_indexes(conn, "assets", {"ix_assets_employee_id_status"})
+    _create_model_indexes(conn, "goals", {"ix_goals_employee_id_due_date"})
+
+
+# ------------------------------------------------------------
+#  0002 — Denormalized profile snapshots
+# ------------------------------------------------------------
+def _0002_profile_snapshots(conn):
+    if not _table_exists(conn, "employees") or inspect(conn).has_table("employee_profile_snapshots"):
+        return
+    Base.metadata.tables["employee_profile_snapshots"].create(bind=conn)
+    print("   + employee_profile_snapshots "
+          "(fill with `python -m services.profile_snapshot_service`)")
+
+
+# ------------------------------------------------------------
+#  0003 — Date-ordered indexes for keyset-paginated history
+# ------------------------------------------------------------
+def _0003_history_paging_indexes(conn):
+    _create_model_indexes(conn, "leave_records", {"ix_leave_records_employee_id_start_date"})
+    _create_model_indexes(conn, "assets", {"ix_assets_employee_id_issue_date"})
+
+
+# ------------------------------------------------------------
+#  0004 — Manager lookups for the team view's recursive CTE
+# ------------------------------------------------------------
+def _0004_manager_index(conn):
+    _create_model_indexes(conn, "employees", {"ix_employees_manager_id"})
+
+
+# ------------------------------------------------------------
+#  0005 — Server-side chat history
+# ------------------------------------------------------------
+def _0005_chat_messages(conn):
+    if not _table_exists(conn, "employees") or inspect(conn).has_table("chat_messages"):
+        return
+    # Creates ix_chat_messages_employee_id_id with the table.
+    Base.metadata.tables["chat_messages"].create(bind=conn)
+    print("   + chat_messages")
+
+
+MIGRATIONS = [
+    ("0001_child_table_indexes", _0001_child_table_indexes),
+    ("0002_profile_snapshots", _0002_profile_snapshots),
+    ("0003_history_paging_indexes", _0003_history_paging_indexes),
+    ("0004_manager_index", _0004_manager_index),
+    ("0005_chat_messages", _0005_chat_messages),
+]
+
+
+def applied_versions(conn):
+    return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def upgrade(bind=engine):
+    """Apply pending migrations in order, each in its own transaction."""
+    import models  # noqa: F401  (registers the model tables on Base)
+
+    _migrations_metadata.create_all(bind=bind)
+
+    with bind.connect() as conn:
+        done = applied_versions(conn)
+
+    for version, migrate in MIGRATIONS:
+        if version in done:
+            continue
+
+        print(f"⏳ Applying migration {version}…")
+        with bind.begin() as conn:
+            migrate(conn)
+            conn.execute(schema_migrations.insert().values(
+                version=version, applied_at=datetime.utcnow()
+            ))
+        print(f"✅ Applied {version}")
+
+
+if __name__ == "__main__":
+    upgrade()
@@ -1,6 +1,9 @@
+from datetime import datetime
+
 from sqlalchemy import (
-    Column, Integer, String, Date, Text, Float, ForeignKey, Boolean, JSON
+    Column, Integer, String, Date, DateTime, Text, Float, ForeignKey, Boolean, JSON, Index
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from database import Base, engine
 
@@ -25,7 +28,7 @@ class Employee(Base):
     join_date = Column(Date)
     employment_type = Column(String(50))  # Full-time, Contract, Intern
 
-    manager_id = Column(Integer, ForeignKey("employees.id"), nullable=True)
+    manager_id = Column(Integer, ForeignKey("employees.id"), nullable=True, index=True)
     manager = relationship("Employee", remote_side=[id])
 
     emergency_contact = Column(String(100))
@@ -56,6 +59,11 @@ class EmployeeSalary(Base):
 
     employee = relationship("Employee", back_populates="salary")
 
+    # One salary row per employee (also serves as the FK index).
+    __table_args__ = (
+        Index("uq_employee_salary_employee_id", "employee_id", unique=True),
+    )
+
 # ============================================================
 #  LEAVE RECORDS TABLE
 # ============================================================
@@ -71,6 +79,12 @@ class LeaveRecord(Base):
 
     employee = relationship("Employee", back_populates="leaves")
 
+    # Leading employee_id doubles as the FK index.
+    __table_args__ = (
+        Index("ix_leave_records_employee_id_status", "employee_id", "status"),
+        Index("ix_leave_records_employee_id_start_date", "employee_id", "start_date"),
+    )
+
 # ============================================================
 #  SKILLS & CERTIFICATIONS TABLE
 # ============================================================
@@ -78,7 +92,7 @@ class SkillRecord(Base):
     __tablename__ = "skills"
 
     id = Column(Integer, primary_key=True)
-    employee_id = Column(Integer, ForeignKey("employees.id"))
+    employee_id = Column(Integer, ForeignKey("employees.id"), index=True)
     skill_name = Column(String(100))
     experience_years = Column(Float)
     certification = Column(String(150), nullable=True)
@@ -101,6 +115,11 @@ class AssetRecord(Base):
 
     employee = relationship("Employee", back_populates="assets")
 
+    __table_args__ = (
+        Index("ix_assets_employee_id_status", "employee_id", "status"),
+        Index("ix_assets_employee_id_issue_date", "employee_id", "issue_date"),
+    )
+
 # ============================================================
 #  PERFORMANCE GOALS TABLE
 # ============================================================
@@ -116,6 +135,41 @@ class GoalRecord(Base):
 
     employee = relationship("Employee", back_populates="goals")
 
+    __table_args__ = (
+        Index("ix_goals_employee_id_due_date", "employee_id", "due_date"),
+    )
+
+
+# ============================================================
+#  PROFILE SNAPSHOT TABLE (denormalized, read at login)
+# ============================================================
+class EmployeeProfileSnapshot(Base):
+    __tablename__ = "employee_profile_snapshots"
+
+    employee_code = Column(String(50), primary_key=True)
+    employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False, unique=True)
+    profile = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)
+    version = Column(Integer, nullable=False, default=1)  # bumped on every refresh
+    refreshed_at = Column(DateTime, default=datetime.utcnow)
+
+
+# ============================================================
+#  CHAT HISTORY TABLE (server-side conversation log)
+# ============================================================
+class ChatMessage(Base):
+    __tablename__ = "chat_messages"
+
+    id = Column(Integer, primary_key=True)
+    employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
+    role = Column(String(10), nullable=False)  # user / ai
+    content = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Pages are read newest-first per employee: WHERE employee_id = ? AND id < ?
+    __table_args__ = (
+        Index("ix_chat_messages_employee_id_id", "employee_id", "id"),
+    )
+
 
 # ============================================================
 #  CREATE ALL TABLES
@@ -123,6 +177,12 @@ class GoalRecord(Base):
 def create_tables():
     print("⏳ Creating corporate-grade HRMS tables in Supabase…")
     Base.metadata.create_all(bind=engine)
+
+    # create_all skips tables that already exist; the (idempotent)
+    # migrations bring those up to date and record what was applied.
+    from migrations import upgrade
+    upgrade(engine)
+
     print("✅ All tables created successfully!")
 
 
@@ -0,0 +1,96 @@
+import os
+import re
+
+from cards import extract_headings
+
+# ---------------------------------------------------------
+# POLICY CATEGORIES
+# ---------------------------------------------------------
+# Tagged onto every chunk at ingestion (metadata["category"]) and matched
+# against questions at query time. Chunks that match nothing are
+# "general" and stay in scope for every filtered search.
+CATEGORY_KEYWORDS = {
+    "holidays": ("holiday", "holidays", "festival", "public holiday", "holiday calendar", "observance"),
+    "leave": ("leave", "leaves", "vacation", "time off", "absence", "sick", "maternity", "paternity", "sabbatical"),
+    "payroll": ("payroll", "salary", "salaries", "payslip", "compensation", "ctc", "bonus", "reimbursement",
+                "expense", "tax", "provident fund", "pf", "esi", "allowance", "gratuity"),
+    "it": ("it policy", "it support", "it asset", "laptop", "device", "password", "vpn", "software",
+           "email account", "access card", "wifi", "helpdesk", "information technology"),
+    "separation": ("resignation", "resign", "notice period", "exit", "relieving", "full and final",
+                   "leave the company", "leave the organisation", "leave the organization", "quit"),
+    "compliance": ("compliance", "code of conduct", "ethics", "harassment", "posh", "confidential",
+                   "data protection", "privacy", "bribery", "whistle", "disciplinary", "conflict of interest"),
+}
+
+GENERAL = "general"
+
+# Headings weigh more than body text when tagging a chunk.
+HEADING_WEIGHT = 3
+
+# A scoped search whose best hit scores below this relevance (cosine
+# similarity) is discarded in favour of an unfiltered one.
+SCOPED_RETRIEVAL_MIN_RELEVANCE = float(os.getenv("SCOPED_RETRIEVAL_MIN_RELEVANCE", "0.3"))
+
+# Keywords match with a plural ending too ("IT assets", "payslips").
+_PATTERNS = {
+    category: re.compile(r"\b(" + "|".join(re.escape(k) for k in keywords) + r")(?:e?s)?\b", re.IGNORECASE)
+    for category, keywords in CATEGORY_KEYWORDS.items()
+}
+# "IT" in a heading is the department, not the pronoun.
+_IT_HEADING = re.compile(r"\bIT\b")
+
+
+def _scores(text, weight=1):
+    return {category: weight * len(pattern.findall(text)) for category, pattern in _PATTERNS.items()}
+
+
+def _best(scores):
+    category, score = max(scores.items(), key=lambda item: item[1])
+    return category if score > 0 else None
+
+
+# ---------------------------------------------------------
+# INGESTION
+# ---------------------------------------------------------
+def tag_chunks(chunks):
+    """
+    Set metadata["category"] on each chunk, in document order. Headings
+    inside a chunk count most; a chunk without headings continues the
+    section of the last heading before it.
+    """
+    section = None
+    for chunk in chunks:
+        headings = extract_headings(chunk.page_content)
+
+        scores = _scores(chunk.page_content)
+        for heading in headings:
+            for category, score in _scores(heading, HEADING_WEIGHT).items():
+                scores[category] += score
+            if _IT_HEADING.search(heading):
+                scores["it"] += HEADING_WEIGHT
+
+        heading_sections = [c for c in (_best(_scores(h)) for h in headings) if c]
+        if not heading_sections and section is not None:
+            scores[section] += HEADING_WEIGHT
+
+        chunk.metadata["category"] = _best(scores) or section or GENERAL
+        if heading_sections:
+            section = heading_sections[-1]
+
+    return chunks
+
+
+# ---------------------------------------------------------
+# QUERY TIME
+# ---------------------------------------------------------
+def detect_categories(question: str):
+    """Categories a question is about (empty: search everything)."""
+    return sorted(category for category, pattern in _PATTERNS.items() if pattern.search(question))
+
+
+def category_filter(categories):
+    """
+    Metadata pre-filter for Chroma and NumpyVectorStore searches. Untagged
+    ("general") chunks always stay in scope.
+    """
+    return {"category": {"$in": sorted(set(categories) | {GENERAL})}}
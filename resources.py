@@ -0,0 +1,242 @@
+import os
+import time
+import shutil
+import logging
+import streamlit as st
+
+from lazy_imports import timed_import
+
+POLICY_PDF_PATH = "data/umbrella_corp_policies.pdf"
+
+# chroma (default) | numpy (compact memory-mapped index, see vector_index.py)
+VECTOR_STORE_BACKEND = os.getenv("VECTOR_STORE_BACKEND", "chroma")
+NUMPY_INDEX_DIR = os.getenv("NUMPY_INDEX_DIR", "/tmp/axis_index")
+CHROMA_DIR = os.getenv("CHROMA_DIR", "/tmp/chroma")
+
+# Chroma HNSW graph: links per node, build-time and query-time beam width
+# (Chroma's defaults). Raise M / ef for recall on large corpora, see
+# benchmarks/bench_ann.py. The numpy backend's IVF settings live in vector_index.py.
+HNSW_M = int(os.getenv("HNSW_M", "16"))
+HNSW_EF_CONSTRUCTION = int(os.getenv("HNSW_EF_CONSTRUCTION", "100"))
+HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", "10"))
+
+
+# ---------------------------------------------------------
+# CACHED RESOURCES (shared by app.py and the warm-up stage)
+# ---------------------------------------------------------
+@st.cache_resource(show_spinner="Loading LLM…")
+def load_llm():
+    """Cache the chat model for the configured LLM_BACKEND (groq / openai-compatible)."""
+    try:
+        return timed_import("llm_backends").create_llm()
+    except Exception as e:
+        logging.error(f"LLM init error: {e}")
+        raise
+
+
+@st.cache_resource(show_spinner="Loading Embeddings…")
+def load_embedding():
+    """Cache the embeddings object for the configured EMBEDDING_BACKEND (torch / onnx / onnx-int8)."""
+    try:
+        return timed_import("embeddings").create_embeddings()
+    except Exception as e:
+        logging.error(f"Embedding init error: {e}")
+        raise
+
+
+def load_policy_chunks(pdf_path):
+    """Load the policy PDF and split it into retrieval chunks."""
+    PyPDFLoader = timed_import("langchain_community.document_loaders").PyPDFLoader
+    RecursiveCharacterTextSplitter = timed_import("langchain_text_splitters").RecursiveCharacterTextSplitter
+
+    loader = PyPDFLoader(pdf_path)
+    docs = loader.load()
+
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=2000,
+        chunk_overlap=200,
+    )
+    # metadata["category"] drives the retriever's pre-filter.
+    return timed_import("policy_categories").tag_chunks(text_splitter.split_documents(docs))
+
+
+# Bump when chunking or chunk metadata changes, so existing indexes rebuild.
+INDEX_SCHEMA = 3
+
+
+def _index_manifest(pdf_path, backend):
+    """What an index was built from, and how; a mismatch means it is stale."""
+    return {
+        "schema": INDEX_SCHEMA,
+        "source": os.path.abspath(pdf_path),
+        "sha256": timed_import("vector_index").content_hash(pdf_path),
+        "model": timed_import("embeddings").EMBEDDING_MODEL,
+        "ann": _ann_params(backend),
+    }
+
+
+def _ann_params(backend):
+    """Build-time index parameters of a backend (query-time ones can change freely)."""
+    if backend == "chroma":
+        return {
+            "hnsw:space": "cosine",  # relevance = cosine similarity, as in NumpyVectorStore
+            "hnsw:M": HNSW_M,
+            "hnsw:construction_ef": HNSW_EF_CONSTRUCTION,
+        }
+    vector_index = timed_import("vector_index")
+    return {
+        "lists": vector_index.NUMPY_INDEX_LISTS,
+        "partition_field": vector_index.NUMPY_INDEX_PARTITION_FIELD,
+        "dtype": vector_index.NUMPY_INDEX_DTYPE,
+    }
+
+
+def _build_chroma(path, chunks, embedding_function):
+    Chroma = timed_import("langchain_community.vectorstores").Chroma
+    return Chroma.from_documents(
+        documents=chunks,
+        embedding=embedding_function,
+        persist_directory=path,
+        collection_metadata={**_ann_params("chroma"), "hnsw:search_ef": HNSW_EF_SEARCH},
+    )
+
+
+def _open_chroma(path, embedding_function):
+    Chroma = timed_import("langchain_community.vectorstores").Chroma
+    store = Chroma(persist_directory=path, embedding_function=embedding_function)
+
+    # search_ef is query-time: apply the current setting, no rebuild needed.
+    collection = store._collection
+    metadata = dict(collection.metadata or {})
+    if metadata.get("hnsw:search_ef") != HNSW_EF_SEARCH:
+        collection.modify(metadata={**metadata, "hnsw:search_ef": HNSW_EF_SEARCH})
+    return store
+
+
+def _build_numpy(path, chunks, embedding_function):
+    return timed_import("vector_index").NumpyVectorStore.from_texts(
+        [d.page_content for d in chunks],
+        embedding_function,
+        metadatas=[d.metadata for d in chunks],
+        persist_directory=path,
+    )
+
+
+def _open_numpy(path, embedding_function):
+    return timed_import("vector_index").NumpyVectorStore.load(path, embedding_function)
+
+
+# backend → (index root, build(path, chunks, embedding), open(path, embedding))
+INDEX_BACKENDS = {
+    "chroma": (CHROMA_DIR, _build_chroma, _open_chroma),
+    "numpy": (NUMPY_INDEX_DIR, _build_numpy, _open_numpy),
+}
+
+VALIDATION_QUERY = "leave policy"
+
+
+def _version_age(path):
+    manifest_path = os.path.join(path, timed_import("vector_index").MANIFEST_FILE)
+    return time.time() - os.path.getmtime(manifest_path)
+
+
+def build_index_version(pdf_path, embedding_function, backend=VECTOR_STORE_BACKEND, max_age=None):
+    """
+    Return the index version to serve for `pdf_path`, building one first
+    if the current version is stale or older than `max_age` seconds. A
+    build goes into a new version directory, is validated, then published
+    by flipping the `current` pointer; queries keep using the old version
+    meanwhile. Check and build run under a host-wide file lock, so
+    concurrent workers build at most once.
+    """
+    index_manager = timed_import("index_manager")
+    vector_index = timed_import("vector_index")
+    root, build, open_version = INDEX_BACKENDS[backend]
+
+    with vector_index.file_lock(os.path.join(root, ".lock")):
+        manifest = _index_manifest(pdf_path, backend)
+        current = index_manager.current_version(root)
+        if current:
+            current_path = index_manager.version_path(root, current)
+            fresh = max_age is None or _version_age(current_path) < max_age
+            if fresh and vector_index.read_manifest(current_path) == manifest:
+                return current
+
+        version = index_manager.new_version_name(manifest)
+        path = index_manager.version_path(root, version)
+
+        try:
+            chunks = load_policy_chunks(pdf_path)
+            build(path, chunks, embedding_function)
+
+            # Validate from disk, the way workers will open it, before publishing.
+            probe = open_version(path, embedding_function).similarity_search(VALIDATION_QUERY, k=1)
+            if not probe:
+                raise RuntimeError(f"index {version} failed validation (empty probe result)")
+        except BaseException:
+            # Never leave a half-built version behind.
+            shutil.rmtree(path, ignore_errors=True)
+            raise
+
+        # Manifest last: its presence marks a complete version.
+        vector_index.write_manifest(path, manifest)
+        index_manager.publish(root, version)
+        index_manager.retire_old_versions(root)
+
+        logging.info(f"Built policy index {version} ({len(chunks)} chunks).")
+        return version
+
+
+@st.cache_resource(show_spinner=False)
+def _policy_index(backend=VECTOR_STORE_BACKEND):
+    """The process-wide handle queries go through; survives index rebuilds."""
+    root, _, open_version = INDEX_BACKENDS[backend]
+    return timed_import("index_manager").PolicyIndex(
+        root, lambda path: open_version(path, load_embedding())
+    )
+
+
+def policy_index_version(pdf_path):
+    """Identity of the policy source the index is built from."""
+    stat = os.stat(pdf_path)
+    return f"{stat.st_size}-{int(stat.st_mtime)}"
+
+
+@st.cache_resource(show_spinner=False)
+def load_policy_card(pdf_path, index_version):
+    """
+    Policy summary quick-action card for one index version (the cache
+    key), built once per host and shared by every worker process.
+    """
+    build_policy_card = timed_import("cards").build_policy_card
+    return timed_import("shared_cache").shared_cache.get_or_set(
+        f"policy_card:{index_version}",
+        lambda: build_policy_card(load_policy_chunks(pdf_path)),
+    )
+
+
+@st.cache_resource(show_spinner="Loading Company Policies…")
+def init_vector_store(pdf_path):
+    """
+    The policy index for VECTOR_STORE_BACKEND (chroma / numpy), as a
+    PolicyIndex whose `acquire()` yields the current vector store. The
+    on-disk version is reused if it matches the PDF, else one is built.
+    Later rebuilds happen off the request path (index_refresher.py) and
+    are swapped in without interrupting in-flight queries.
+    Returns None on failure (the app will show existing error handling).
+    """
+    try:
+        embedding_function = load_embedding()
+
+        # If pdf doesn't exist, return None (error handled by caller)
+        if not os.path.isfile(pdf_path):
+            logging.error(f"Vector Store Error: PDF not found at {pdf_path}")
+            return None
+
+        index = _policy_index()
+        index.switch_to(build_index_version(pdf_path, embedding_function))
+        return index
+
+    except Exception as e:
+        logging.error(f"Vector Store Error: {str(e)}")
+        return None
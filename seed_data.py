@@ -6,6 +6,8 @@ from models import (
     SkillRecord, AssetRecord, GoalRecord
 )
 from database import SessionLocal, engine
+from services.profile_snapshot_service import rebuild_all_snapshots
+from login_lookup import notify_employee_codes_changed
 
 # -------------------------------------------
 # Utility Generators
@@ -26,7 +28,7 @@ GOAL_STATUS = ["In Progress", "Completed", "Pending Review"]
 # -------------------------------------------
 # Create Fake Employee Records
 # -------------------------------------------
-def create_employee(i):
+def create_employee(i, manager_id=None):
     join_date = date(2022, random.randint(1, 12), random.randint(1, 28))
 
     return Employee(
@@ -42,7 +44,7 @@ def create_employee(i):
         location=random.choice(LOCATIONS),
         join_date=join_date,
         employment_type=random.choice(["Full-Time", "Contract", "Intern"]),
-        manager_id=None,  # Manager link optional
+        manager_id=manager_id,
         emergency_contact="9876543210",
         address="123 Corporate Street, Chennai"
     )
@@ -111,11 +113,16 @@ def seed_database():
 
     print("⏳ Seeding HRMS employee database…")
 
+    employee_ids = {}
+
     for i in range(1, 6):  # Create 5 employees (increase if needed)
-        emp = create_employee(i)
+        # Small org chart for the team view: EMP001 → EMP002/EMP003, EMP002 → EMP004/EMP005
+        manager_code = {2: 1, 3: 1, 4: 2, 5: 2}.get(i)
+        emp = create_employee(i, manager_id=employee_ids.get(manager_code))
         db.add(emp)
         db.commit()
         db.refresh(emp)
+        employee_ids[i] = emp.id
 
         # Add salary
         db.add(create_salary(emp.id))
@@ -138,6 +145,11 @@ def seed_database():
 
         print(f"✅ Added Employee {emp.employee_code}")
 
+    # Login reads the denormalized snapshot, so refresh it after writes.
+    rebuild_all_snapshots(db)
+    # Running app workers reload their in-memory login codes.
+    notify_employee_codes_changed()
+
     db.close()
     print("\n🎉 DATABASE SEEDING COMPLETED SUCCESSFULLY!")
 
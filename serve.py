@@ -0,0 +1,162 @@
+"""
+Run AxisConnect as several Streamlit worker processes on one node.
+
+The parent builds the policy index once (in a throwaway process, under the
+index file lock), then imports the ML stack, loads the embedding model and
+opens the index, and only then forks the workers. Imported modules and
+model weights are shared copy-on-write, the numpy index is one memory map
+in the page cache, and values shared across workers go through
+shared_cache.
+
+Worker i listens on --port + i and serves /metrics on METRICS_PORT + i.
+Streamlit keeps session state inside its worker, so put a load balancer
+with sticky sessions (WebSocket-aware) in front.
+
+    VECTOR_STORE_BACKEND=numpy EMBEDDING_THREADS=2 python serve.py --workers 8 --port 8501
+"""
+import os
+import sys
+import time
+import signal
+import logging
+import argparse
+import multiprocessing
+
+from dotenv import load_dotenv
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+
+# ---------------------------------------------------------
+# PARENT: build once, preload, fork
+# ---------------------------------------------------------
+def _build_index(pdf_path):
+    from resources import init_vector_store
+
+    if init_vector_store(pdf_path) is None:
+        sys.exit(1)
+
+
+def build_index(pdf_path):
+    """
+    Build (or validate) the index in a spawned process. Inference must not
+    run in the parent: torch / ONNX Runtime thread pools don't survive fork.
+    """
+    process = multiprocessing.get_context("spawn").Process(target=_build_index, args=(pdf_path,))
+    process.start()
+    process.join()
+    if process.exitcode != 0:
+        raise SystemExit("❌ Policy index build failed")
+
+
+def preload(pdf_path):
+    """Load what the workers should share copy-on-write."""
+    from lazy_imports import HEAVY_MODULES, timed_import, log_import_timings
+    import embeddings
+    import resources
+
+    for module_name in HEAVY_MODULES:
+        timed_import(module_name)
+    log_import_timings()
+
+    # ONNX Runtime sessions are not fork-safe; each worker creates its own
+    # (the int8 model is ~23 MB). Torch weights are loaded here and shared.
+    if embeddings.EMBEDDING_BACKEND == "torch":
+        resources.load_embedding()
+
+    # A numpy index is a read-only memory map: safe to open before fork.
+    # Chroma holds SQLite handles, so each worker opens its own client.
+    if resources.VECTOR_STORE_BACKEND == "numpy":
+        resources.init_vector_store(pdf_path)
+    else:
+        logging.warning("VECTOR_STORE_BACKEND=chroma: every worker loads its own index copy; use numpy to share it")
+
+
+# ---------------------------------------------------------
+# WORKER
+# ---------------------------------------------------------
+def run_worker(index, port, metrics_port):
+    import metrics
+    import database
+
+    database.dispose_pools_after_fork()
+    metrics.METRICS_PORT = metrics_port
+
+    from streamlit.web.cli import main as streamlit_main
+
+    sys.argv = [
+        "streamlit", "run", APP_PATH,
+        "--server.port", str(port),
+        "--server.headless", "true",
+    ]
+    logging.info(f"Worker {index} (pid {os.getpid()}) on :{port}")
+    streamlit_main()
+
+
+def fork_worker(index, port, metrics_port):
+    pid = os.fork()
+    if pid == 0:
+        try:
+            run_worker(index, port, metrics_port)
+        finally:
+            os._exit(0)
+    return pid
+
+
+def main():
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--port", type=int, default=8501, help="port of worker 0; worker i uses port + i")
+    args = parser.parse_args()
+
+    from resources import POLICY_PDF_PATH
+    import metrics
+
+    print(f"⏳ Preparing shared resources for {args.workers} workers…")
+    start = time.perf_counter()
+    build_index(POLICY_PDF_PATH)
+    preload(POLICY_PDF_PATH)
+    print(f"✅ Ready in {time.perf_counter() - start:.1f}s, forking workers")
+
+    base_metrics_port = metrics.METRICS_PORT
+    ports = {}
+    for i in range(args.workers):
+        metrics_port = base_metrics_port + i if base_metrics_port > 0 else 0
+        ports[fork_worker(i, args.port + i, metrics_port)] = (i, args.port + i, metrics_port)
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(ports):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    # Supervise: restart a worker that dies, from the same preloaded parent.
+    while ports:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+
+        worker = ports.pop(pid, None)
+        if worker is None or stopping:
+            continue
+
+        logging.warning(f"Worker {worker[0]} (pid {pid}) exited with status {status}; restarting")
+        ports[fork_worker(*worker)] = worker
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+from datetime import date
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from models import LeaveRecord, AssetRecord, GoalRecord
+
+# Annual entitlement per leave type (days). Mirrors the leave policy;
+# types missing here are reported without a remaining balance.
+LEAVE_ENTITLEMENTS = {
+    "Sick Leave": 12,
+    "Casual Leave": 12,
+    "Earned Leave": 18,
+}
+
+
+def _leave_days(db: Session):
+    """Inclusive day count of a leave row, in the dialect's date arithmetic."""
+    if db.get_bind().dialect.name == "sqlite":
+        return func.julianday(LeaveRecord.end_date) - func.julianday(LeaveRecord.start_date) + 1
+    return LeaveRecord.end_date - LeaveRecord.start_date + 1
+
+
+# -----------------------------------------------------------
+# LEAVE BALANCE (current calendar year)
+# -----------------------------------------------------------
+def get_leave_summary(db: Session, employee_id: int, year: int = None):
+    year = year or date.today().year
+    days = func.sum(_leave_days(db))
+
+    rows = db.execute(
+        select(LeaveRecord.leave_type, LeaveRecord.status, days, func.count())
+        .where(
+            LeaveRecord.employee_id == employee_id,
+            LeaveRecord.start_date >= date(year, 1, 1),
+            LeaveRecord.start_date < date(year + 1, 1, 1),
+        )
+        .group_by(LeaveRecord.leave_type, LeaveRecord.status)
+    ).all()
+
+    summary = {
+        leave_type: {"entitlement": days_allowed, "taken": 0, "pending": 0}
+        for leave_type, days_allowed in LEAVE_ENTITLEMENTS.items()
+    }
+    pending_requests = 0
+
+    for leave_type, status, total_days, count in rows:
+        entry = summary.setdefault(leave_type, {"entitlement": None, "taken": 0, "pending": 0})
+        if status == "Approved":
+            entry["taken"] += int(total_days or 0)
+        elif status == "Pending":
+            entry["pending"] += int(total_days or 0)
+            pending_requests += count
+
+    for entry in summary.values():
+        if entry["entitlement"] is not None:
+            entry["remaining"] = entry["entitlement"] - entry["taken"]
+
+    return {"year": year, "by_type": summary, "pending_requests": pending_requests}
+
+
+# -----------------------------------------------------------
+# ASSETS BY STATUS
+# -----------------------------------------------------------
+def get_asset_counts(db: Session, employee_id: int):
+    rows = db.execute(
+        select(AssetRecord.status, func.count())
+        .where(AssetRecord.employee_id == employee_id)
+        .group_by(AssetRecord.status)
+    ).all()
+    return {status: count for status, count in rows}
+
+
+# -----------------------------------------------------------
+# GOAL COMPLETION
+# -----------------------------------------------------------
+def get_goal_summary(db: Session, employee_id: int):
+    rows = db.execute(
+        select(GoalRecord.status, func.count())
+        .where(GoalRecord.employee_id == employee_id)
+        .group_by(GoalRecord.status)
+    ).all()
+
+    by_status = {status: count for status, count in rows}
+    total = sum(by_status.values())
+    completed = by_status.get("Completed", 0)
+
+    return {
+        "total": total,
+        "completed": completed,
+        "completion_ratio": round(completed / total, 2) if total else None,
+        "by_status": by_status,
+    }
+
+
+# -----------------------------------------------------------
+# ALL AGGREGATES (what the prompt gets instead of raw lists)
+# -----------------------------------------------------------
+def get_employee_aggregates(db: Session, employee_id: int):
+    return {
+        "leave_balance": get_leave_summary(db, employee_id),
+        "assets_by_status": get_asset_counts(db, employee_id),
+        "goals": get_goal_summary(db, employee_id),
+    }
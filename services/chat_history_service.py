@@ -0,0 +1,111 @@
+import os
+from datetime import datetime
+
+from sqlalchemy import insert, select
+from models import ChatMessage
+
+# Messages kept in st.session_state (and sent to the LLM as history).
+CHAT_MEMORY_WINDOW = int(os.getenv("CHAT_MEMORY_WINDOW", "20"))
+
+# History is trimmed in blocks: memory grows to window + block messages,
+# then drops back to the newest `window`. Between trims the history sent
+# to the LLM only grows at the end, so its prompt prefix stays cacheable.
+CHAT_TRIM_BLOCK = int(os.getenv("CHAT_TRIM_BLOCK", "10"))
+
+# Messages fetched per "load earlier" click.
+CHAT_PAGE_SIZE = int(os.getenv("CHAT_PAGE_SIZE", "20"))
+
+
+def _to_dict(row):
+    return {"id": row.id, "role": row.role, "content": row.content}
+
+
+# -----------------------------------------------------------
+# PERSISTENT CONVERSATION STORE (one running thread per employee)
+# -----------------------------------------------------------
+class ChatHistoryStore:
+    """
+    Server-side chat log. Each turn is written with a single batched
+    INSERT; only the newest `window` (+ up to `block`) messages are held in
+    memory and older pages are read on demand with keyset pagination on `id`.
+    """
+
+    def __init__(self, session_factory, employee_id: int, window: int = CHAT_MEMORY_WINDOW, read_session_factory=None,
+                 block: int = CHAT_TRIM_BLOCK):
+        self.session_factory = session_factory
+        self.read_session_factory = read_session_factory or session_factory
+        self.employee_id = employee_id
+        self.window = window
+        self.block = block
+
+    def load_recent(self):
+        """
+        Newest `window` messages, oldest first. Read from the primary: a
+        replica may not have the turns this session just wrote yet.
+        """
+        return self._load(None, self.window, self.session_factory)
+
+    def load_before(self, before_id, limit: int = CHAT_PAGE_SIZE):
+        """The `limit` messages older than `before_id` (or the newest ones), oldest first."""
+        return self._load(before_id, limit, self.read_session_factory)
+
+    def _load(self, before_id, limit, session_factory):
+        query = select(ChatMessage).where(ChatMessage.employee_id == self.employee_id)
+        if before_id is not None:
+            query = query.where(ChatMessage.id < before_id)
+        query = query.order_by(ChatMessage.id.desc()).limit(limit)
+
+        db = session_factory()
+        try:
+            rows = db.execute(query).scalars().all()
+        finally:
+            db.close()
+
+        return [_to_dict(r) for r in reversed(rows)]
+
+    def append(self, *messages):
+        """
+        Persist messages in one round trip and stamp their ids in place
+        (ids are the pagination cursor for older pages).
+        """
+        if not messages:
+            return
+
+        now = datetime.utcnow()
+        rows = [
+            {
+                "employee_id": self.employee_id,
+                "role": m["role"],
+                "content": m["content"],
+                "created_at": now,
+            }
+            for m in messages
+        ]
+
+        db = self.session_factory()
+        try:
+            ids = db.execute(
+                insert(ChatMessage).returning(ChatMessage.id, sort_by_parameter_order=True),
+                rows,
+            ).scalars().all()
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        for message, message_id in zip(messages, ids):
+            message["id"] = message_id
+
+    def trim(self, messages):
+        """
+        Once more than `window + block` messages are held, drop all but the
+        newest `window`, in place. Returns the dropped messages.
+        """
+        if len(messages) <= self.window + self.block:
+            return []
+        dropped = messages[:-self.window]
+        del messages[:-self.window]
+        return dropped
+
@@ -1,6 +1,11 @@
 from sqlalchemy.orm import Session
 from models import Employee, EmployeeSalary, LeaveRecord, SkillRecord, GoalRecord, AssetRecord
 
+# Rows per list section kept in the profile (newest first). Older rows are
+# fetched on demand through services/history_service.py, so profile size
+# stays bounded regardless of tenure.
+PROFILE_LIST_LIMIT = 10
+
 # -----------------------------------------------------------
 # FETCH EMPLOYEE BY CODE OR EMAIL
 # -----------------------------------------------------------
@@ -17,11 +22,30 @@ def get_full_employee_profile(db: Session, employee_id: int):
         return None
 
     salary = db.query(EmployeeSalary).filter(EmployeeSalary.employee_id == employee_id).first()
-    leaves = db.query(LeaveRecord).filter(LeaveRecord.employee_id == employee_id).all()
-    skills = db.query(SkillRecord).filter(SkillRecord.employee_id == employee_id).all()
-    goals = db.query(GoalRecord).filter(GoalRecord.employee_id == employee_id).all()
-    assets = db.query(AssetRecord).filter(AssetRecord.employee_id == employee_id).all()
+    leaves = (
+        db.query(LeaveRecord).filter(LeaveRecord.employee_id == employee_id)
+        .order_by(LeaveRecord.start_date.desc(), LeaveRecord.id.desc()).limit(PROFILE_LIST_LIMIT).all()
+    )
+    skills = (
+        db.query(SkillRecord).filter(SkillRecord.employee_id == employee_id)
+        .order_by(SkillRecord.id.desc()).limit(PROFILE_LIST_LIMIT).all()
+    )
+    goals = (
+        db.query(GoalRecord).filter(GoalRecord.employee_id == employee_id)
+        .order_by(GoalRecord.due_date.desc(), GoalRecord.id.desc()).limit(PROFILE_LIST_LIMIT).all()
+    )
+    assets = (
+        db.query(AssetRecord).filter(AssetRecord.employee_id == employee_id)
+        .order_by(AssetRecord.issue_date.desc(), AssetRecord.id.desc()).limit(PROFILE_LIST_LIMIT).all()
+    )
+
+    return serialize_profile(employee, salary, leaves, skills, goals, assets)
+
 
+# -----------------------------------------------------------
+# ORM ROWS → PROFILE DICT (shared by live loads and snapshots)
+# -----------------------------------------------------------
+def serialize_profile(employee, salary, leaves, skills, goals, assets):
     return {
         "employee_code": employee.employee_code,
         "name": employee.name,
@@ -47,38 +71,43 @@ def get_full_employee_profile(db: Session, employee_id: int):
             "tax_deduction": salary.tax_deduction if salary else None
         },
 
-        "skills": [
-            {
-                "skill_name": s.skill_name,
-                "experience_years": s.experience_years,
-                "certification": s.certification
-            } for s in skills
-        ],
-
-        "goals": [
-            {
-                "goal_title": g.goal_title,
-                "description": g.description,
-                "due_date": str(g.due_date),
-                "status": g.status
-            } for g in goals
-        ],
-
-        "assets": [
-            {
-                "asset_type": a.asset_type,
-                "serial_number": a.serial_number,
-                "issue_date": str(a.issue_date),
-                "status": a.status
-            } for a in assets
-        ],
-
-        "leave_history": [
-            {
-                "leave_type": l.leave_type,
-                "start_date": str(l.start_date),
-                "end_date": str(l.end_date),
-                "status": l.status
-            } for l in leaves
-        ]
+        "skills": [serialize_skill(s) for s in skills],
+        "goals": [serialize_goal(g) for g in goals],
+        "assets": [serialize_asset(a) for a in assets],
+        "leave_history": [serialize_leave(l) for l in leaves],
+    }
+
+
+def serialize_skill(s):
+    return {
+        "skill_name": s.skill_name,
+        "experience_years": s.experience_years,
+        "certification": s.certification
+    }
+
+
+def serialize_goal(g):
+    return {
+        "goal_title": g.goal_title,
+        "description": g.description,
+        "due_date": str(g.due_date),
+        "status": g.status
+    }
+
+
+def serialize_asset(a):
+    return {
+        "asset_type": a.asset_type,
+        "serial_number": a.serial_number,
+        "issue_date": str(a.issue_date),
+        "status": a.status
+    }
+
+
+def serialize_leave(l):
+    return {
+        "leave_type": l.leave_type,
+        "start_date": str(l.start_date),
+        "end_date": str(l.end_date),
+        "status": l.status
     }
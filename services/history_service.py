@@ -0,0 +1,165 @@
+import re
+from datetime import date, timedelta
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from models import LeaveRecord, AssetRecord, GoalRecord, SkillRecord
+from services.employee_service import (
+    serialize_leave, serialize_asset, serialize_goal, serialize_skill
+)
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 50
+
+# section → (model, date column used for ordering / range filters, serializer)
+SECTIONS = {
+    "leave_history": (LeaveRecord, LeaveRecord.start_date, serialize_leave),
+    "assets": (AssetRecord, AssetRecord.issue_date, serialize_asset),
+    "goals": (GoalRecord, GoalRecord.due_date, serialize_goal),
+    "skills": (SkillRecord, None, serialize_skill),
+}
+
+# Words in a question that ask for a section's rows.
+SECTION_KEYWORDS = {
+    "leave_history": ("leave history", "past leave", "previous leave", "leave record", "leaves i took", "my leaves"),
+    "assets": ("asset", "laptop", "monitor", "access card", "id card", "serial"),
+    "goals": ("goal", "okr", "objective", "performance"),
+    "skills": ("skill", "certification", "certified"),
+}
+
+# Status vocabulary per section (question word → stored value).
+STATUS_WORDS = {
+    "leave_history": {"approved": "Approved", "pending": "Pending", "rejected": "Rejected"},
+    "assets": {"active": "Active", "returned": "Returned", "lost": "Lost"},
+    "goals": {"completed": "Completed", "in progress": "In Progress", "pending review": "Pending Review"},
+    "skills": {},
+}
+
+# Whole phrases only: "furthermore" or "earlier this year" are not page requests.
+NEXT_PAGE_PHRASES = ("show more", "see more", "load more", "more results", "older ones", "older entries",
+                     "older records", "earlier ones", "earlier entries", "previous ones", "next page", "next ones")
+_NEXT_PAGE = re.compile(r"\b(" + "|".join(re.escape(p) for p in NEXT_PAGE_PHRASES) + r")\b")
+
+
+# -----------------------------------------------------------
+# KEYSET-PAGINATED SLICES (newest first)
+# -----------------------------------------------------------
+def get_history_page(
+    db: Session,
+    employee_id: int,
+    section: str,
+    status: str = None,
+    date_from: date = None,
+    date_to: date = None,
+    cursor=None,
+    limit: int = DEFAULT_PAGE_SIZE,
+):
+    """
+    One page of a child table for an employee, filtered by status and an
+    inclusive date range. `cursor` is the `next_cursor` of the previous
+    page; pages never use OFFSET, so deep pages cost the same as the first.
+    """
+    model, date_col, serialize = SECTIONS[section]
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    query = select(model).where(model.employee_id == employee_id)
+
+    if status is not None and hasattr(model, "status"):
+        query = query.where(func.lower(model.status) == status.lower())
+
+    if date_col is not None:
+        if date_from is not None:
+            query = query.where(date_col >= date_from)
+        if date_to is not None:
+            query = query.where(date_col <= date_to)
+
+    if cursor is not None:
+        cursor_date, cursor_id = cursor
+        if date_col is None or cursor_date is None:
+            query = query.where(model.id < cursor_id)
+        else:
+            cursor_date = date.fromisoformat(cursor_date)
+            query = query.where(or_(
+                date_col < cursor_date,
+                and_(date_col == cursor_date, model.id < cursor_id),
+            ))
+
+    order = [model.id.desc()] if date_col is None else [date_col.desc(), model.id.desc()]
+    rows = db.execute(query.order_by(*order).limit(limit + 1)).scalars().all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        last_date = getattr(last, date_col.key) if date_col is not None else None
+        next_cursor = (last_date.isoformat() if last_date else None, last.id)
+
+    return {
+        "items": [serialize(r) for r in rows],
+        "has_more": has_more,
+        "next_cursor": next_cursor,
+    }
+
+
+# -----------------------------------------------------------
+# QUESTION → SLICE REQUEST
+# -----------------------------------------------------------
+def _date_range(question: str, today: date):
+    match = re.search(r"\b(?:in|for|during)\s+(20\d{2})\b", question)
+    if match:
+        year = int(match.group(1))
+        return date(year, 1, 1), date(year, 12, 31)
+
+    match = re.search(r"\blast\s+(\d+)\s+(day|week|month|year)s?\b", question)
+    if match:
+        n, unit = int(match.group(1)), match.group(2)
+        days = {"day": 1, "week": 7, "month": 30, "year": 365}[unit] * n
+        return today - timedelta(days=days), today
+
+    if "this year" in question:
+        return date(today.year, 1, 1), today
+    if "last year" in question:
+        return date(today.year - 1, 1, 1), date(today.year - 1, 12, 31)
+    if "last month" in question:
+        return today - timedelta(days=30), today
+
+    return None, None
+
+
+def asks_for_next_page(user_input: str):
+    """Whether a question asks for the next page ("show more", "older ones")."""
+    return bool(_NEXT_PAGE.search(user_input.lower()))
+
+
+def parse_history_requests(user_input: str, today: date = None):
+    """
+    Which sections a question asks for, with any status / date-range filter
+    and whether it wants the next page ("show more", "older ones").
+    Returns {section: {"status", "date_from", "date_to", "next_page"}}.
+    """
+    question = user_input.lower()
+    today = today or date.today()
+
+    date_from, date_to = _date_range(question, today)
+    next_page = asks_for_next_page(question)
+
+    requests = {}
+    for section, keywords in SECTION_KEYWORDS.items():
+        if not any(keyword in question for keyword in keywords):
+            continue
+
+        status = None
+        # Longest match first so "pending review" beats "pending".
+        for word in sorted(STATUS_WORDS[section], key=len, reverse=True):
+            if re.search(rf"\b{word}\b", question):
+                status = STATUS_WORDS[section][word]
+                break
+
+        requests[section] = {
+            "status": status, "date_from": date_from, "date_to": date_to, "next_page": next_page
+        }
+
+    return requests
@@ -0,0 +1,182 @@
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from models import (
+    Employee, EmployeeSalary, LeaveRecord, SkillRecord, GoalRecord, AssetRecord,
+    EmployeeProfileSnapshot,
+)
+from services.employee_service import PROFILE_LIST_LIMIT, get_full_employee_profile, serialize_profile
+
+# -----------------------------------------------------------
+# LOGIN READ PATH — one pre-serialized row per employee
+# -----------------------------------------------------------
+def get_profile_snapshot(db: Session, employee_code: str):
+    return db.get(EmployeeProfileSnapshot, employee_code)
+
+
+def load_employee_profile(db: Session, employee_code: str, write_db: Session = None):
+    """
+    (employee_id, profile, version) for a login, or (None, None, None) if
+    the code is unknown. Reads the snapshot; only employees without one are
+    built live and stored through `write_db` (pass a primary session when
+    `db` is a read replica). Snapshots are kept current by the write paths
+    (refresh_profile_snapshot / invalidate_profile_snapshot) and the batch
+    rebuild.
+    """
+    snapshot = get_profile_snapshot(db, employee_code)
+    if snapshot is not None:
+        return snapshot.employee_id, snapshot.profile, snapshot.version
+
+    employee_id = db.execute(
+        select(Employee.id).where(Employee.employee_code == employee_code)
+    ).scalar()
+    if employee_id is None:
+        return None, None, None
+
+    write_db = write_db or db
+    profile = refresh_profile_snapshot(write_db, employee_id)
+    version = write_db.execute(
+        select(EmployeeProfileSnapshot.version).where(EmployeeProfileSnapshot.employee_id == employee_id)
+    ).scalar()
+    return employee_id, profile, version
+
+
+# -----------------------------------------------------------
+# REFRESH ON WRITE — call after changing an employee's HR data
+# -----------------------------------------------------------
+def refresh_profile_snapshot(db: Session, employee_id: int):
+    profile = get_full_employee_profile(db, employee_id)
+    if profile is None:
+        return None
+
+    # One upsert statement: two concurrent first logins for the same
+    # employee both succeed instead of colliding. Keyed on employee_id,
+    # the stable identity, so a changed employee code updates the row.
+    table = EmployeeProfileSnapshot.__table__
+    dialect_insert = sqlite_insert if db.get_bind().dialect.name == "sqlite" else pg_insert
+    stmt = dialect_insert(table).values(
+        employee_code=profile["employee_code"],
+        employee_id=employee_id,
+        profile=profile,
+        version=1,
+        refreshed_at=datetime.utcnow(),
+    )
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[table.c.employee_id],
+        set_={
+            "employee_code": stmt.excluded.employee_code,
+            "profile": stmt.excluded.profile,
+            "version": table.c.version + 1,
+            "refreshed_at": stmt.excluded.refreshed_at,
+        },
+    ))
+    db.commit()
+    return profile
+
+
+def invalidate_profile_snapshot(db: Session, employee_id: int):
+    """
+    Drop an employee's snapshot so the next login rebuilds it. For writers
+    that cannot afford the rebuild inline (bulk HR imports, other services).
+    """
+    db.execute(delete(EmployeeProfileSnapshot).where(EmployeeProfileSnapshot.employee_id == employee_id))
+    db.commit()
+
+
+# -----------------------------------------------------------
+# BATCH JOB — full-company rebuild
+# -----------------------------------------------------------
+def _group_by_employee(rows):
+    grouped = defaultdict(list)
+    for row in rows:
+        grouped[row.employee_id].append(row)
+    return grouped
+
+
+def _latest_per_employee(db: Session, model, order_by, ids):
+    """Newest PROFILE_LIST_LIMIT rows per employee for a whole batch, in one query."""
+    rank = func.row_number().over(partition_by=model.employee_id, order_by=order_by).label("rank")
+    ranked = select(model.id, rank).where(model.employee_id.in_(ids)).subquery()
+
+    rows = db.execute(
+        select(model)
+        .join(ranked, model.id == ranked.c.id)
+        .where(ranked.c.rank <= PROFILE_LIST_LIMIT)
+        .order_by(model.employee_id, ranked.c.rank)
+    ).scalars()
+    return _group_by_employee(rows)
+
+
+def rebuild_all_snapshots(db: Session, batch_size: int = 1000):
+    """
+    Rebuild every snapshot. Employees are walked in id order, and each
+    batch costs a constant number of queries (employees, one per child
+    table, the upsert) regardless of batch size. Returns the count.
+    """
+    total = 0
+    last_id = 0
+
+    while True:
+        employees = db.execute(
+            select(Employee).where(Employee.id > last_id).order_by(Employee.id).limit(batch_size)
+        ).scalars().all()
+        if not employees:
+            break
+
+        ids = [e.id for e in employees]
+        salaries = {s.employee_id: s for s in db.execute(
+            select(EmployeeSalary).where(EmployeeSalary.employee_id.in_(ids))
+        ).scalars()}
+        # Same ordering + per-section cap as get_full_employee_profile.
+        leaves = _latest_per_employee(db, LeaveRecord, [LeaveRecord.start_date.desc(), LeaveRecord.id.desc()], ids)
+        skills = _latest_per_employee(db, SkillRecord, [SkillRecord.id.desc()], ids)
+        goals = _latest_per_employee(db, GoalRecord, [GoalRecord.due_date.desc(), GoalRecord.id.desc()], ids)
+        assets = _latest_per_employee(db, AssetRecord, [AssetRecord.issue_date.desc(), AssetRecord.id.desc()], ids)
+
+        versions = dict(db.execute(
+            select(EmployeeProfileSnapshot.employee_id, EmployeeProfileSnapshot.version)
+            .where(EmployeeProfileSnapshot.employee_id.in_(ids))
+        ).all())
+
+        now = datetime.utcnow()
+        rows = [
+            {
+                "employee_code": e.employee_code,
+                "employee_id": e.id,
+                "profile": serialize_profile(
+                    e, salaries.get(e.id), leaves[e.id], skills[e.id], goals[e.id], assets[e.id]
+                ),
+                "version": versions.get(e.id, 0) + 1,
+                "refreshed_at": now,
+            }
+            for e in employees
+        ]
+
+        # Portable upsert: replace the batch's rows in one transaction.
+        db.execute(delete(EmployeeProfileSnapshot).where(EmployeeProfileSnapshot.employee_id.in_(ids)))
+        db.execute(insert(EmployeeProfileSnapshot), rows)
+        db.commit()
+
+        # Drop ORM state so memory stays flat across the whole company.
+        db.expunge_all()
+
+        total += len(rows)
+        last_id = ids[-1]
+        print(f"   … {total} snapshots refreshed")
+
+    return total
+
+
+if __name__ == "__main__":
+    from database import SessionLocal
+
+    db = SessionLocal()
+    print("⏳ Rebuilding employee profile snapshots…")
+    count = rebuild_all_snapshots(db)
+    db.close()
+    print(f"✅ Rebuilt {count} snapshots")
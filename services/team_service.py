@@ -0,0 +1,112 @@
+from collections import defaultdict
+from datetime import date
+
+from sqlalchemy import func, literal, select
+from sqlalchemy.orm import Session
+
+from models import Employee, LeaveRecord, AssetRecord, GoalRecord
+
+# Guards against cycles in bad manager data and runaway org charts.
+MAX_TEAM_DEPTH = 10
+MAX_TEAM_SIZE = 500
+
+TEAM_KEYWORDS = ("my team", "team member", "reportee", "direct report", "my reports", "reporting to me", "subordinate")
+
+
+def asks_about_team(user_input: str) -> bool:
+    question = user_input.lower()
+    return any(keyword in question for keyword in TEAM_KEYWORDS)
+
+
+# -----------------------------------------------------------
+# REPORTING TREE (recursive CTE)
+# -----------------------------------------------------------
+def get_reports(db: Session, manager_id: int, transitive: bool = True):
+    """
+    Direct (depth 1) and, optionally, transitive reports of a manager in a
+    single recursive query. Returns Employee rows paired with their depth.
+    """
+    tree = (
+        select(Employee.id.label("id"), literal(1).label("depth"))
+        .where(Employee.manager_id == manager_id)
+        .cte("reporting_tree", recursive=True)
+    )
+
+    if transitive:
+        tree = tree.union_all(
+            select(Employee.id, tree.c.depth + 1)
+            .join(tree, Employee.manager_id == tree.c.id)
+            .where(tree.c.depth < MAX_TEAM_DEPTH)
+        )
+
+    # UNION ALL can revisit a node if the data has a cycle; keep the shallowest.
+    depths = (
+        select(tree.c.id, func.min(tree.c.depth).label("depth"))
+        .group_by(tree.c.id)
+        .subquery()
+    )
+
+    return db.execute(
+        select(Employee, depths.c.depth)
+        .join(depths, Employee.id == depths.c.id)
+        .order_by(depths.c.depth, Employee.name)
+        .limit(MAX_TEAM_SIZE)
+    ).all()
+
+
+# -----------------------------------------------------------
+# TEAM SUMMARY — constant number of queries for any team size
+# -----------------------------------------------------------
+def get_team_summary(db: Session, manager_id: int, transitive: bool = True):
+    """
+    Compact per-report summaries for the assistant: identity, leave this
+    year, pending leave requests, active assets and goal completion.
+    Four queries in total: the tree plus one grouped query per child table.
+    """
+    reports = get_reports(db, manager_id, transitive)
+    if not reports:
+        return []
+
+    ids = [employee.id for employee, _ in reports]
+    year_start = date(date.today().year, 1, 1)
+
+    leaves = defaultdict(dict)
+    for employee_id, status, count in db.execute(
+        select(LeaveRecord.employee_id, LeaveRecord.status, func.count())
+        .where(LeaveRecord.employee_id.in_(ids), LeaveRecord.start_date >= year_start)
+        .group_by(LeaveRecord.employee_id, LeaveRecord.status)
+    ):
+        leaves[employee_id][status] = count
+
+    active_assets = dict(db.execute(
+        select(AssetRecord.employee_id, func.count())
+        .where(AssetRecord.employee_id.in_(ids), AssetRecord.status == "Active")
+        .group_by(AssetRecord.employee_id)
+    ).all())
+
+    goals = defaultdict(dict)
+    for employee_id, status, count in db.execute(
+        select(GoalRecord.employee_id, GoalRecord.status, func.count())
+        .where(GoalRecord.employee_id.in_(ids))
+        .group_by(GoalRecord.employee_id, GoalRecord.status)
+    ):
+        goals[employee_id][status] = count
+
+    summaries = []
+    for employee, depth in reports:
+        goal_counts = goals[employee.id]
+        goals_total = sum(goal_counts.values())
+
+        summaries.append({
+            "employee_code": employee.employee_code,
+            "name": employee.name,
+            "role": employee.role,
+            "department": employee.department,
+            "level": "direct" if depth == 1 else f"indirect ({depth})",
+            "leaves_this_year": leaves[employee.id].get("Approved", 0),
+            "pending_leave_requests": leaves[employee.id].get("Pending", 0),
+            "active_assets": active_assets.get(employee.id, 0),
+            "goals_completed": f"{goal_counts.get('Completed', 0)}/{goals_total}",
+        })
+
+    return summaries
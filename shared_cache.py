@@ -0,0 +1,95 @@
+import os
+import json
+import stat
+import time
+import sqlite3
+import logging
+import threading
+
+# ---------------------------
+# Config
+# ---------------------------
+# One SQLite file per host, shared by every worker process (WAL mode lets
+# readers and a writer work concurrently). Its directory must belong to
+# the app user and be closed to everyone else (created 0700 if missing).
+SHARED_CACHE_PATH = os.path.expanduser(os.getenv("SHARED_CACHE_PATH", "~/.cache/axisconnect/cache.sqlite3"))
+
+_MISSING = object()
+
+
+# ---------------------------------------------------------
+# CROSS-PROCESS KEY/VALUE CACHE
+# ---------------------------------------------------------
+class SharedCache:
+    """
+    Small JSON-value cache on local disk. Unlike `st.cache_resource`,
+    entries are visible to every worker on the host, so a value is
+    computed once per node instead of once per process. Errors (including
+    undecodable rows and an unsafe directory) are logged and treated as
+    misses; the cache is never a source of truth.
+    """
+
+    def __init__(self, path: str = SHARED_CACHE_PATH):
+        self.path = path
+        self._local = threading.local()
+
+    def _conn(self):
+        # One connection per thread, reopened after a fork.
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            _check_private_dir(os.path.dirname(os.path.abspath(self.path)))
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, key: str, default=None):
+        try:
+            row = self._conn().execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] < time.time()):
+                return default
+            return json.loads(row[0])
+        except (sqlite3.Error, OSError, TypeError, ValueError) as e:
+            logging.warning(f"Shared cache read failed: {e}")
+            return default
+
+    def set(self, key: str, value, ttl: float = None):
+        expires_at = time.time() + ttl if ttl else None
+        try:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at),
+            )
+        except (sqlite3.Error, OSError, TypeError, ValueError) as e:
+            logging.warning(f"Shared cache write failed: {e}")
+
+    def delete(self, key: str):
+        try:
+            self._conn().execute("DELETE FROM cache WHERE key = ?", (key,))
+        except (sqlite3.Error, OSError) as e:
+            logging.warning(f"Shared cache delete failed: {e}")
+
+    def get_or_set(self, key: str, compute, ttl: float = None):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value, ttl)
+        return value
+
+
+def _check_private_dir(path):
+    """Create `path` 0700 if missing; refuse one another user could write to."""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.stat(path)
+    if info.st_uid != os.getuid() or info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise PermissionError(f"{path} must be owned by this user and not group/world-writable")
+
+
+shared_cache = SharedCache()
@@ -0,0 +1,70 @@
+import os
+import re
+import time
+
+import metrics
+
+# ---------------------------
+# Config
+# ---------------------------
+# A flush goes to the UI once this many characters are buffered or this
+# long has passed since the last one, cut at the last word / line break.
+STREAM_FLUSH_CHARS = int(os.getenv("STREAM_FLUSH_CHARS", "48"))
+STREAM_FLUSH_SECONDS = float(os.getenv("STREAM_FLUSH_SECONDS", "0.08"))
+
+_LAST_BREAK = re.compile(r"\s(?=\S*\Z)")
+
+
+def coalesce_stream(chunks, flush_chars=STREAM_FLUSH_CHARS, flush_seconds=STREAM_FLUSH_SECONDS):
+    """
+    Regroup tiny token chunks into word- or line-sized pieces for
+    `st.write_stream`, which re-renders the whole markdown block per chunk.
+    The first chunk is passed through so time-to-first-token is unchanged.
+    Records the decode rate (tokens/sec) and flushes per response.
+    """
+    buffer = ""
+    parts = []
+    flushes = 0
+    first_at = last_flush = None
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        now = time.perf_counter()
+        parts.append(chunk)
+
+        if first_at is None:
+            first_at = last_flush = now
+            flushes += 1
+            yield chunk
+            continue
+
+        buffer += chunk
+        if len(buffer) < flush_chars and now - last_flush < flush_seconds:
+            continue
+
+        # Cut after the last whitespace so words / markdown markers arrive whole.
+        match = _LAST_BREAK.search(buffer)
+        if match:
+            cut = match.end()
+        elif len(buffer) >= 4 * flush_chars:
+            # No word break in a long run (URLs, table rules): flush it anyway.
+            cut = len(buffer)
+        else:
+            continue
+
+        flushes += 1
+        last_flush = now
+        yield buffer[:cut]
+        buffer = buffer[cut:]
+
+    if buffer:
+        flushes += 1
+        yield buffer
+
+    if first_at is not None:
+        elapsed = time.perf_counter() - first_at
+        tokens = metrics.estimate_tokens("".join(parts))
+        if elapsed > 0:
+            metrics.OUTPUT_TOKENS_PER_SECOND.observe(tokens / elapsed)
+        metrics.STREAM_FLUSHES.observe(flushes)
@@ -0,0 +1,411 @@
+import os
+import json
+import fcntl
+import hashlib
+import logging
+from contextlib import contextmanager
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+
+MATRIX_FILE = "embeddings.npy"
+SCALES_FILE = "scales.npy"
+LAYOUT_FILE = "layout.json"
+LIST_OFFSETS_FILE = "list_offsets.npy"
+CENTROIDS_FILE = "centroids.npy"
+DOCUMENTS_FILE = "documents.json"
+MANIFEST_FILE = "manifest.json"
+
+# ---------------------------
+# Config
+# ---------------------------
+# Approximate search for large corpora (IVF): at build time rows are
+# clustered into NUMPY_INDEX_LISTS lists, and a query scores only the
+# NUMPY_INDEX_PROBES lists nearest to it. 0 lists = exact search, right
+# for a single handbook; ~4 * sqrt(chunks) for 100k+ chunks.
+NUMPY_INDEX_LISTS = int(os.getenv("NUMPY_INDEX_LISTS", "0"))
+NUMPY_INDEX_PROBES = int(os.getenv("NUMPY_INDEX_PROBES", "16"))
+
+# Metadata field (e.g. "tenant") whose values each get a contiguous
+# partition of the index; a filter on it scores only those partitions.
+NUMPY_INDEX_PARTITION_FIELD = os.getenv("NUMPY_INDEX_PARTITION_FIELD", "")
+
+# float32 | int8 (scalar-quantized per row: 4x smaller matrix, slightly noisier scores)
+NUMPY_INDEX_DTYPE = os.getenv("NUMPY_INDEX_DTYPE", "float32")
+
+# Searches over at most this many rows (a small partition, a selective
+# filter) are exact instead of going through the IVF lists.
+EXACT_SEARCH_MAX_ROWS = int(os.getenv("EXACT_SEARCH_MAX_ROWS", "20000"))
+
+SCORE_BLOCK_ROWS = 16384
+
+
+# ---------------------------------------------------------
+# Compact in-memory vector index
+# ---------------------------------------------------------
+class NumpyVectorStore(VectorStore):
+    """
+    Read-only vector store. All L2-normalised embeddings live in one
+    contiguous float32 (or int8) matrix; on disk it is memory-mapped, so
+    every worker process shares the same page-cache copy. For a handbook
+    (a few hundred chunks) top-k is a single matrix-vector product; large
+    corpora are laid out in partitions and IVF lists (see IndexLayout) so
+    a query scores only a few slices of the matrix.
+    """
+
+    def __init__(self, embedding, matrix, documents, scales=None, layout=None, probes=NUMPY_INDEX_PROBES):
+        self.embedding = embedding
+        self.matrix = matrix
+        self.documents = documents
+        self.scales = scales  # per-row dequantization factors of an int8 matrix
+        self.layout = layout or IndexLayout.flat(len(documents))
+        self.probes = probes
+        self._field_rows = {}  # metadata field → {value: row ids}, built on first filter
+
+    @property
+    def embeddings(self):
+        return self.embedding
+
+    def __len__(self):
+        return len(self.documents)
+
+    # ---------------------------------------------------------
+    # Build / persist / load
+    # ---------------------------------------------------------
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, persist_directory=None, manifest=None, **kwargs):
+        vectors = np.asarray(embedding.embed_documents(list(texts)), dtype=np.float32)
+        metadatas = metadatas or [{} for _ in texts]
+        documents = [Document(page_content=t, metadata=m) for t, m in zip(texts, metadatas)]
+        return cls.from_vectors(embedding, vectors, documents, persist_directory, manifest, **kwargs)
+
+    @classmethod
+    def from_vectors(cls, embedding, vectors, documents, persist_directory=None, manifest=None,
+                     lists=NUMPY_INDEX_LISTS, partition_field=NUMPY_INDEX_PARTITION_FIELD,
+                     dtype=NUMPY_INDEX_DTYPE, probes=NUMPY_INDEX_PROBES):
+        vectors = _normalize(vectors)
+        layout = None
+        if lists > 0 or partition_field:
+            order, layout = build_layout(vectors, documents, lists, partition_field)
+            vectors, documents = vectors[order], [documents[i] for i in order]
+        scales = None
+        if dtype == "int8":
+            vectors, scales = quantize(vectors)
+
+        if persist_directory is None:
+            return cls(embedding, vectors, documents, scales, layout, probes)
+
+        save_index(persist_directory, vectors, documents, manifest or {}, scales, layout)
+        return cls.load(persist_directory, embedding, probes)
+
+    @classmethod
+    def load(cls, persist_directory, embedding, probes=NUMPY_INDEX_PROBES):
+        matrix = np.load(os.path.join(persist_directory, MATRIX_FILE), mmap_mode="r")
+        with open(os.path.join(persist_directory, DOCUMENTS_FILE), encoding="utf-8") as f:
+            documents = [Document(page_content=d["page_content"], metadata=d["metadata"]) for d in json.load(f)]
+
+        if matrix.shape[0] != len(documents):
+            raise ValueError(
+                f"Index at {persist_directory} is inconsistent: "
+                f"{matrix.shape[0]} vectors vs {len(documents)} documents"
+            )
+
+        scales_path = os.path.join(persist_directory, SCALES_FILE)
+        scales = np.load(scales_path) if os.path.exists(scales_path) else None
+        return cls(embedding, matrix, documents, scales, IndexLayout.load(persist_directory), probes)
+
+    def add_texts(self, texts, metadatas=None, **kwargs):
+        raise NotImplementedError("NumpyVectorStore is read-only; rebuild it with from_documents()")
+
+    # ---------------------------------------------------------
+    # Search
+    # ---------------------------------------------------------
+    def _rows_for(self, field, value):
+        rows = self._field_rows.get(field)
+        if rows is None:
+            grouped = {}
+            for i, doc in enumerate(self.documents):
+                grouped.setdefault(doc.metadata.get(field), []).append(i)
+            rows = {v: np.asarray(ids, dtype=np.int64) for v, ids in grouped.items()}
+            self._field_rows[field] = rows
+        return rows.get(value, np.empty(0, dtype=np.int64))
+
+    def _filter_rows(self, filter):
+        """
+        Row ids matching a Chroma-style metadata filter:
+        {"field": value} or {"field": {"$in": [values]}}, ANDed across fields.
+        """
+        rows = None
+        for field, condition in filter.items():
+            values = condition["$in"] if isinstance(condition, dict) else [condition]
+            parts = [self._rows_for(field, v) for v in values]
+            matched = np.unique(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+            rows = matched if rows is None else np.intersect1d(rows, matched)
+        return rows
+
+    def _scores(self, rows, query):
+        """Cosine scores of `query` against matrix[rows] (a slice or row ids)."""
+        if self.scales is None:
+            return self.matrix[rows] @ query
+        # Upcast int8 block by block so it never needs a full float32 copy.
+        matrix = self.matrix[rows]
+        scores = np.empty(matrix.shape[0], dtype=np.float32)
+        for start in range(0, matrix.shape[0], SCORE_BLOCK_ROWS):
+            block = matrix[start:start + SCORE_BLOCK_ROWS]
+            scores[start:start + block.shape[0]] = block.astype(np.float32) @ query
+        return scores * self.scales[rows]
+
+    def search_rows(self, embedding, k=4, filter=None, probes=None):
+        """Top-k (row ids, scores), best first."""
+        query = _normalize(np.asarray(embedding, dtype=np.float32)[None, :])[0]
+        no_rows = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        # Pre-filter: the partition field picks whole partitions; other
+        # fields are matched row by row.
+        partitions = self.layout.select_partitions(filter)
+        residual = {f: c for f, c in (filter or {}).items() if f != self.layout.partition_field}
+        rows = self._filter_rows(filter) if residual else None
+        if rows is not None and rows.size == 0:
+            return no_rows
+
+        if rows is not None and rows.size <= EXACT_SEARCH_MAX_ROWS:
+            candidates, scores = rows, self._scores(rows, query)
+        else:
+            ranges = [(s, e) for s, e in self.layout.ranges(query, partitions, probes or self.probes) if e > s]
+            if not ranges:
+                return no_rows
+            candidates = np.concatenate([np.arange(s, e) for s, e in ranges])
+            scores = np.concatenate([self._scores(slice(s, e), query) for s, e in ranges])
+            if rows is not None:
+                keep = np.isin(candidates, rows, assume_unique=True)
+                candidates, scores = candidates[keep], scores[keep]
+
+        k = min(k, scores.shape[0])
+        if k < scores.shape[0]:
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+        else:
+            top = np.argsort(-scores)
+        return candidates[top], scores[top]
+
+    def similarity_search_with_score_by_vector(self, embedding, k=4, filter=None, probes=None, **kwargs):
+        if len(self.documents) == 0:
+            return []
+        ids, scores = self.search_rows(embedding, k, filter, probes)
+        return [(self.documents[i], float(score)) for i, score in zip(ids, scores)]
+
+    def similarity_search_by_vector(self, embedding, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k, **kwargs)]
+
+    def similarity_search_with_score(self, query, k=4, **kwargs):
+        return self.similarity_search_with_score_by_vector(self.embedding.embed_query(query), k, **kwargs)
+
+    def similarity_search(self, query, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    def _select_relevance_score_fn(self):
+        # Scores are cosine similarities; report them as-is, like Chroma's
+        # cosine space, so relevance thresholds mean the same on both backends.
+        return lambda score: score
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.ascontiguousarray(vectors / np.clip(norms, 1e-12, None), dtype=np.float32)
+
+
+def quantize(vectors):
+    """Rows → (int8 codes, float32 scales) with row ≈ codes * scale; each row uses the full ±127."""
+    scales = np.clip(np.abs(vectors).max(axis=1), 1e-12, None) / 127.0
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+# ---------------------------------------------------------
+# Partitions + IVF lists (large corpora)
+# ---------------------------------------------------------
+class IndexLayout:
+    """
+    Row order of an index: grouped by partition (one value of the
+    partition field, e.g. one tenant's handbook), then by IVF list, so
+    every (partition, list) cell is the contiguous slice
+    offsets[p, l]:offsets[p, l + 1]. The flat layout of a small index is
+    one partition holding one list.
+    """
+
+    def __init__(self, offsets, centroids=None, partition_field=None, partitions=(None,)):
+        self.offsets = offsets
+        self.centroids = centroids
+        self.partition_field = partition_field or None
+        self.partitions = list(partitions)
+        self._partition_ids = {value: i for i, value in enumerate(self.partitions)}
+
+    @classmethod
+    def flat(cls, rows):
+        return cls(np.array([[0, rows]], dtype=np.int64))
+
+    @classmethod
+    def load(cls, persist_directory):
+        """The saved layout, or None for a flat index."""
+        try:
+            with open(os.path.join(persist_directory, LAYOUT_FILE), encoding="utf-8") as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        centroids_path = os.path.join(persist_directory, CENTROIDS_FILE)
+        return cls(
+            np.load(os.path.join(persist_directory, LIST_OFFSETS_FILE)),
+            np.load(centroids_path) if os.path.exists(centroids_path) else None,
+            meta["partition_field"],
+            meta["partitions"],
+        )
+
+    def select_partitions(self, filter):
+        """Partition ids a metadata filter allows (all, unless it conditions the partition field)."""
+        if not filter or self.partition_field not in filter:
+            return range(len(self.partitions))
+        condition = filter[self.partition_field]
+        values = condition["$in"] if isinstance(condition, dict) else [condition]
+        return sorted({self._partition_ids[v] for v in values if v in self._partition_ids})
+
+    def ranges(self, query, partitions, probes):
+        """Slices to score: the whole partitions when small or without IVF, else their `probes` nearest lists."""
+        rows = sum(int(self.offsets[p, -1] - self.offsets[p, 0]) for p in partitions)
+        if self.centroids is None or rows <= EXACT_SEARCH_MAX_ROWS:
+            return [(int(self.offsets[p, 0]), int(self.offsets[p, -1])) for p in partitions]
+
+        centroid_scores = self.centroids @ query
+        probes = min(probes, centroid_scores.shape[0])
+        nearest = np.sort(np.argpartition(-centroid_scores, probes - 1)[:probes])
+        return [(int(self.offsets[p, l]), int(self.offsets[p, l + 1])) for p in partitions for l in nearest]
+
+
+def _assign(vectors, centroids):
+    """Nearest centroid of every row, computed in blocks."""
+    assignment = np.empty(vectors.shape[0], dtype=np.int64)
+    for start in range(0, vectors.shape[0], SCORE_BLOCK_ROWS):
+        block = vectors[start:start + SCORE_BLOCK_ROWS]
+        assignment[start:start + block.shape[0]] = np.argmax(block @ centroids.T, axis=1)
+    return assignment
+
+
+def train_centroids(vectors, lists, iterations=10, sample_per_list=64, seed=0):
+    """Spherical k-means on a sample of the rows."""
+    rng = np.random.default_rng(seed)
+    n = vectors.shape[0]
+    sample = vectors[np.sort(rng.choice(n, min(n, lists * sample_per_list), replace=False))]
+    centroids = sample[rng.choice(sample.shape[0], lists, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignment = _assign(sample, centroids)
+        order = np.argsort(assignment, kind="stable")
+        counts = np.bincount(assignment, minlength=lists)
+        filled = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        centroids[filled] = np.add.reduceat(sample[order], starts[filled])
+        # Re-seed empty lists from random sample rows.
+        empty = np.flatnonzero(counts == 0)
+        centroids[empty] = sample[rng.choice(sample.shape[0], empty.size, replace=False)]
+        centroids = _normalize(centroids)
+    return centroids
+
+
+def build_layout(vectors, documents, lists=0, partition_field=None):
+    """
+    Cluster the rows into `lists` IVF lists (0 = none) and partition them
+    by `partition_field`. Returns (row order, IndexLayout); rows and
+    documents must be reordered by it.
+    """
+    n = vectors.shape[0]
+    partitions, partition_of = [None], np.zeros(n, dtype=np.int64)
+    if partition_field:
+        keys = [doc.metadata.get(partition_field) for doc in documents]
+        partitions = sorted(set(keys), key=str)
+        ids = {value: i for i, value in enumerate(partitions)}
+        partition_of = np.fromiter((ids[key] for key in keys), dtype=np.int64, count=n)
+
+    centroids, list_of, width = None, np.zeros(n, dtype=np.int64), 1
+    if lists > 0:
+        width = min(lists, n)
+        centroids = train_centroids(vectors, width)
+        list_of = _assign(vectors, centroids)
+
+    cell = partition_of * width + list_of
+    order = np.argsort(cell, kind="stable")
+    counts = np.bincount(cell, minlength=len(partitions) * width).reshape(len(partitions), width)
+    ends = np.cumsum(counts).reshape(counts.shape)
+    offsets = np.hstack([ends - counts, ends[:, -1:]])
+    return order, IndexLayout(offsets, centroids, partition_field, partitions)
+
+
+def save_index(persist_directory, matrix, documents, manifest, scales=None, layout=None):
+    """Write matrix (+ int8 scales, layout) + documents + manifest; each file is swapped in atomically."""
+    os.makedirs(persist_directory, exist_ok=True)
+
+    def _replace(name, write):
+        final = os.path.join(persist_directory, name)
+        tmp = f"{final}.tmp-{os.getpid()}"
+        with open(tmp, "wb") as f:
+            write(f)
+        os.replace(tmp, final)
+
+    # Manifest last: its presence marks a complete index.
+    _replace(MATRIX_FILE, lambda f: np.save(f, matrix))
+    if scales is not None:
+        _replace(SCALES_FILE, lambda f: np.save(f, scales))
+    if layout is not None:
+        _replace(LIST_OFFSETS_FILE, lambda f: np.save(f, layout.offsets))
+        if layout.centroids is not None:
+            _replace(CENTROIDS_FILE, lambda f: np.save(f, layout.centroids))
+        _replace(LAYOUT_FILE, lambda f: f.write(json.dumps(
+            {"partition_field": layout.partition_field, "partitions": layout.partitions}
+        ).encode("utf-8")))
+    _replace(DOCUMENTS_FILE, lambda f: f.write(json.dumps(
+        [{"page_content": d.page_content, "metadata": d.metadata} for d in documents]
+    ).encode("utf-8")))
+    write_manifest(persist_directory, manifest)
+
+    logging.info(f"Saved {len(documents)} vectors to {persist_directory}")
+
+
+def write_manifest(persist_directory, manifest):
+    final = os.path.join(persist_directory, MANIFEST_FILE)
+    tmp = f"{final}.tmp-{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, final)
+
+
+def read_manifest(persist_directory):
+    try:
+        with open(os.path.join(persist_directory, MANIFEST_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def content_hash(path, block_size=1 << 20):
+    """sha256 of a source file; unlike mtime, unchanged by a touch or re-copy."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Exclusive lock shared by every process on the host (flock). Index
+    builds hold it, so N workers starting together build once and the
+    rest wait, then load the finished index.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
@@ -0,0 +1,116 @@
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+from lazy_imports import HEAVY_MODULES, timed_import, log_import_timings
+
+
+# ---------------------------------------------------------
+# WARM-UP STAGE
+# ---------------------------------------------------------
+class Warmup:
+    """
+    Builds the LLM client, embedding model and policy index concurrently
+    in the background so the first visitor does not pay for them.
+
+    `ready` is set once every task has finished (successfully or not);
+    failures are kept in `errors` and the foreground loaders retry them.
+    """
+
+    def __init__(self, pdf_path: str):
+        self.pdf_path = pdf_path
+        self.ready = threading.Event()
+        self.errors = {}
+        self.timings = {}
+        self.started_at = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self.ready.is_set()
+
+    def wait(self, timeout: float = None) -> bool:
+        return self.ready.wait(timeout)
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        thread = threading.Thread(target=self._run, name="axis-warmup", daemon=True)
+        thread.start()
+        return self
+
+    # ---------------------------------------------------------
+    # Tasks
+    # ---------------------------------------------------------
+    def _warm_imports(self):
+        # One broken optional module must not stop the others from loading.
+        for module_name in HEAVY_MODULES:
+            try:
+                timed_import(module_name)
+            except Exception as e:
+                self.errors[f"import {module_name}"] = e
+                logging.warning(f"Warm-up import of '{module_name}' failed: {e}")
+
+    def _warm_llm(self):
+        from resources import load_llm
+
+        llm = load_llm()
+        _preconnect_llm(llm)
+
+    def _warm_embedding(self):
+        from resources import load_embedding
+
+        # A dummy pass loads weights into memory and warms the kernels.
+        load_embedding().embed_query("Axis warm-up")
+
+    def _warm_vector_store(self):
+        from resources import init_vector_store
+
+        if init_vector_store(self.pdf_path) is None:
+            raise RuntimeError("vector store did not initialize")
+
+    def _timed(self, name, task):
+        start = time.perf_counter()
+        try:
+            task()
+        except Exception as e:
+            self.errors[name] = e
+            logging.warning(f"Warm-up task '{name}' failed: {e}")
+        finally:
+            self.timings[name] = time.perf_counter() - start
+
+    def _run(self):
+        tasks = {
+            "imports": self._warm_imports,
+            "llm": self._warm_llm,
+            "embedding": self._warm_embedding,
+            "vector_store": self._warm_vector_store,
+        }
+
+        with ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="axis-warmup") as pool:
+            for name, task in tasks.items():
+                pool.submit(self._timed, name, task)
+
+        total = time.perf_counter() - self.started_at
+        summary = ", ".join(f"{name}={elapsed:.2f}s" for name, elapsed in self.timings.items())
+        logging.info(f"Warm-up finished in {total:.2f}s ({summary})")
+        log_import_timings()
+
+        metrics.WARMUP_SECONDS.set(total)
+        metrics.READY.set(1)
+        self.ready.set()
+
+
+def _preconnect_llm(llm):
+    """
+    Open (and keep alive) the HTTP connection to the LLM endpoint with a
+    cheap `GET /models`, so the first chat request skips DNS + TLS setup.
+    """
+    client = getattr(getattr(llm, "client", None), "_client", None)
+    if client is None or not hasattr(client, "models"):
+        return
+
+    try:
+        client.models.list()
+    except Exception as e:
+        logging.warning(f"LLM pre-connect failed: {e}")